@@ -2,29 +2,256 @@
 FastAPI REST API for DuckParqStream
 Provides endpoints for ingestion, querying, and management
 """
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import json
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+import asyncio
 import logging
-
-from config import API_HOST, API_PORT, API_TITLE, API_VERSION
-from ingestion import ingestion_engine
+import threading
+import time
+import zlib
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # zstd request bodies are optional
+    zstandard = None
+
+from config import (
+    API_HOST, API_PORT, API_TITLE, API_VERSION, API_WORKERS, DUCKDB_THREADS,
+    UPLOAD_CHUNK_SIZE, UPLOAD_BATCH_SIZE, GZIP_MIN_SIZE, MAX_DECOMPRESSED_BYTES,
+    HEALTH_CACHE_TTL, STATISTICS_CACHE_TTL, FILES_CACHE_TTL, SCHEMA_CACHE_TTL
+)
+from ingestion import ingestion_engine, ingest_batcher
 from query_engine import query_engine
+from db_pool import db_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Only the server keeps the record_id index current on write; other
+# processes importing the ingestion engine stay free of DuckDB
+ingestion_engine.id_index = query_engine.id_index
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values orjson has no native form for (e.g. DuckDB HUGEINT sums)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson (NaN/Inf become null)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the /ingest coalescing loop for the lifetime of the server"""
+    ingest_batcher.start()
+    yield
+    await ingest_batcher.stop()
+
+
 # Initialize FastAPI
 app = FastAPI(
     title=API_TITLE,
     version=API_VERSION,
-    description="High-performance local JSON storage with DuckDB + Parquet"
+    description="High-performance local JSON storage with DuckDB + Parquet",
+    default_response_class=OrjsonResponse,
+    lifespan=lifespan
 )
 
+# Worker threads for blocking DuckDB/pyarrow calls (keeps the event loop free)
+EXECUTOR = ThreadPoolExecutor(max_workers=DUCKDB_THREADS, thread_name_prefix="duckparq")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a synchronous engine call on the worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(EXECUTOR, partial(func, *args, **kwargs))
+
+
+class ResponseCache:
+    """
+    In-process TTL cache for near-static management responses
+
+    Entries also remember query_engine.data_version(), so files written by
+    other API workers invalidate them too.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str, ttl: float) -> Optional[Any]:
+        """Return the cached value if it is younger than ttl seconds and the data is unchanged"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry or time.monotonic() - entry[0] >= ttl:
+            return None
+        # data_version() stats the partition tree, so it runs off the event loop
+        if entry[1] != await run_blocking(query_engine.data_version):
+            return None
+        return entry[2]
+
+    async def set(self, key: str, value: Any):
+        version = await run_blocking(query_engine.data_version)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), version, value)
+
+    def invalidate(self):
+        """Drop everything (new data was ingested)"""
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+@lru_cache(maxsize=1)
+def _timestamp_for_second(second: int) -> str:
+    return datetime.fromtimestamp(second).isoformat()
+
+
+def current_timestamp() -> str:
+    """ISO timestamp for response bodies, rebuilt at most once per second"""
+    return _timestamp_for_second(int(time.time()))
+
+
+class _OutputLimitReached(Exception):
+    pass
+
+
+class _BoundedZstdDecompressor:
+    """
+    Streaming zstd decompressor with zlib's decompress(data, max_length) bound
+
+    zstandard's decompressobj has no output limit, so a few KB of input
+    could expand to gigabytes in one call. Output is instead pushed through
+    a stream_writer into this object, which stops it at max_length.
+    """
+
+    def __init__(self):
+        self._output = bytearray()
+        self._max_length = 0
+        self._writer = zstandard.ZstdDecompressor().stream_writer(self)
+
+    def write(self, data: bytes) -> int:
+        """Sink for the stream_writer's decompressed blocks"""
+        self._output += data
+        if len(self._output) >= self._max_length:
+            raise _OutputLimitReached()
+        return len(data)
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        """Decompress data, stopping soon after max_length bytes of output"""
+        self._output = bytearray()
+        self._max_length = max_length
+        try:
+            self._writer.write(data)
+        except _OutputLimitReached:
+            # The caller rejects the body; the stream is not resumed
+            pass
+        return bytes(self._output)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def _decompressor(encoding: bytes):
+    """Streaming decompressor for a Content-Encoding, None if unsupported"""
+    if encoding in (b"gzip", b"x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == b"deflate":
+        return zlib.decompressobj()
+    if encoding == b"zstd" and zstandard is not None:
+        return _BoundedZstdDecompressor()
+    return None
+
+
+class DecompressMiddleware:
+    """
+    Transparently decompress request bodies sent with Content-Encoding
+
+    Body chunks are decompressed as they arrive, so streamed uploads
+    (`/ingest/file`) never hold the whole decompressed file in memory.
+    Bodies that expand past max_bytes are rejected with 413.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_DECOMPRESSED_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        encoding = headers.get(b"content-encoding", b"").strip().lower()
+        if encoding in (b"", b"identity"):
+            return await self.app(scope, receive, send)
+
+        decompressor = _decompressor(encoding)
+        if decompressor is None:
+            response = OrjsonResponse(
+                {"detail": f"Unsupported Content-Encoding: {encoding.decode(errors='replace')}"},
+                status_code=415
+            )
+            return await response(scope, receive, send)
+
+        # The handler sees a plain body of unknown length
+        scope = dict(scope, headers=[
+            (key, value) for key, value in scope["headers"]
+            if key not in (b"content-encoding", b"content-length")
+        ])
+
+        total_bytes = 0
+
+        async def receive_decompressed():
+            nonlocal total_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                # One byte past the limit is enough to know the body is too large
+                remaining = self.max_bytes - total_bytes + 1
+                try:
+                    body = decompressor.decompress(message.get("body", b""), remaining)
+                    if not message.get("more_body", False) and len(body) < remaining:
+                        body += decompressor.flush()
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"Invalid {encoding.decode()} body: {e}")
+                total_bytes += len(body)
+                if total_bytes > self.max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Decompressed body exceeds {self.max_bytes} bytes"
+                    )
+                message = {**message, "body": body}
+            return message
+
+        await self.app(scope, receive_decompressed, send)
+
+
+app.add_middleware(DecompressMiddleware)
+
+# Compress large query responses for clients sending Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+
 # CORS middleware for web interface
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +283,10 @@ class IngestRecordRequest(BaseModel):
         description="Type of data (log, event, transaction, etc.)",
         example="log"
     )
+    wait: bool = Field(
+        default=True,
+        description="Wait for the write to finish. If false, respond 202 once the records are queued."
+    )
 
 
 class QueryByIDRequest(BaseModel):
@@ -68,6 +299,11 @@ class QueryByDateRequest(BaseModel):
     start_date: str = Field(..., example="2025-10-01")
     end_date: str = Field(..., example="2025-10-28")
     limit: int = Field(default=100, le=10000)
+    columns: Optional[List[str]] = Field(
+        None,
+        description="Columns to return (default: all). Only these are read from Parquet.",
+        example=["record_id", "data_date"]
+    )
 
 
 class SQLQueryRequest(BaseModel):
@@ -84,6 +320,11 @@ class SearchRequest(BaseModel):
     search_term: str = Field(..., example="test")
     column: Optional[str] = Field(None, example="name")
     limit: int = Field(default=100, le=10000)
+    columns: Optional[List[str]] = Field(
+        None,
+        description="Columns to return (default: all)",
+        example=["record_id", "name"]
+    )
 
 
 # ============================================================================
@@ -97,7 +338,7 @@ async def root():
         "name": API_TITLE,
         "version": API_VERSION,
         "status": "operational",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": current_timestamp(),
         "endpoints": {
             "docs": "/docs",
             "health": "/health",
@@ -107,17 +348,24 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(nocache: bool = False):
     """Health check endpoint"""
+    cached = None if nocache else await response_cache.get("health", HEALTH_CACHE_TTL)
+    if cached is not None:
+        return cached
+
     try:
         # Test database connection
-        stats = query_engine.get_statistics()
+        async with db_pool.acquire() as cursor:
+            stats = await run_blocking(query_engine.get_statistics, cursor=cursor)
 
-        return {
+        result = {
             "status": "healthy",
             "database": "connected",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": current_timestamp()
         }
+        await response_cache.set("health", result)
+        return result
     except Exception as e:
         return JSONResponse(
             status_code=503,
@@ -129,21 +377,29 @@ async def health_check():
 
 
 @app.get("/statistics")
-async def get_statistics():
+async def get_statistics(nocache: bool = False):
     """Get comprehensive dataset statistics"""
+    cached = None if nocache else await response_cache.get("statistics", STATISTICS_CACHE_TTL)
+    if cached is not None:
+        return cached
+
     try:
         # Get query engine stats
-        stats = query_engine.get_statistics()
+        async with db_pool.acquire() as cursor:
+            stats = await run_blocking(query_engine.get_statistics, cursor=cursor)
 
         # Get file stats
-        file_stats = ingestion_engine.get_file_stats()
+        file_stats = await run_blocking(ingestion_engine.get_file_stats)
 
-        return {
+        result = {
             "status": "success",
             "query_statistics": stats.get("statistics", {}),
             "file_statistics": file_stats,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": current_timestamp()
         }
+        if stats.get("status") == "success":
+            await response_cache.set("statistics", result)
+        return result
     except Exception as e:
         logger.error(f"Statistics error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -171,30 +427,42 @@ async def ingest_records(request: IngestRecordRequest):
     ```
 
     This will store in: `2025/10/log_01_20.parquet`
+
+    Concurrent requests for the same date and type are coalesced into a
+    single Parquet write (see `FLUSH_INTERVAL_MS` / `FLUSH_ROWS`).
+
+    With `"wait": false` the response is `202 Accepted` as soon as the
+    records are queued, so client latency no longer includes the disk
+    write; failures are then only logged.
     """
     try:
-        # Parse data_date if provided
-        from datetime import datetime
-        data_date = None
-        if request.data_date:
-            try:
-                # Try parsing ISO format first
-                data_date = datetime.fromisoformat(request.data_date.replace('Z', '+00:00'))
-            except:
-                # Try YYYY-MM-DD format
-                data_date = datetime.strptime(request.data_date, '%Y-%m-%d')
-
-        result = ingestion_engine.append_to_parquet(
+        data_date = _parse_data_date(request.data_date)
+
+        future = await ingest_batcher.enqueue(
             request.records,
             data_date=data_date,
             data_type=request.data_type
         )
 
+        if not request.wait:
+            future.add_done_callback(partial(_finish_queued_ingest, request.data_type))
+            return JSONResponse(status_code=202, content={
+                "status": "accepted",
+                "records_queued": len(request.records),
+                "timestamp": current_timestamp()
+            })
+
+        result = await future
+
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
 
+        response_cache.invalidate()
+        query_engine.notify_ingest(request.data_type)
         return result
 
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Date parsing error: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
@@ -203,6 +471,88 @@ async def ingest_records(request: IngestRecordRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _finish_queued_ingest(data_type: str, future: asyncio.Future):
+    """Invalidate caches (or log the failure) once a queued write completes"""
+    if future.cancelled():
+        return
+    error = future.exception()
+    result = future.result() if error is None else {"status": "error", "message": str(error)}
+
+    if result["status"] == "error":
+        logger.error(f"Queued ingestion failed: {result['message']}")
+        return
+
+    response_cache.invalidate()
+    query_engine.notify_ingest(data_type)
+
+
+@app.post("/ingest/raw")
+async def ingest_raw(
+    request: Request,
+    data_date: Optional[str] = None,
+    data_type: str = "default"
+):
+    """
+    Ingest a raw JSON body without per-record request validation
+
+    The body is a JSON array of records (or a single record object) and is
+    parsed straight from bytes with orjson. Use this for large batches from
+    trusted producers; `/ingest` remains the validated, typed endpoint.
+
+    Example: `POST /ingest/raw?data_date=2025-10-15&data_type=log`
+    with body `[{"id": "123", "name": "test"}]`
+    """
+    try:
+        parsed_date = _parse_data_date(data_date)
+        records = orjson.loads(await request.body())
+
+        if not isinstance(records, list):
+            records = [records]
+
+        result = await run_blocking(
+            ingestion_engine.append_to_parquet,
+            records,
+            data_date=parsed_date,
+            data_type=data_type
+        )
+
+        if result["status"] == "error":
+            raise HTTPException(status_code=400, detail=result["message"])
+
+        response_cache.invalidate()
+        query_engine.notify_ingest(data_type)
+        return result
+
+    except HTTPException:
+        raise
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+    except ValueError as e:
+        logger.error(f"Date parsing error: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    except Exception as e:
+        logger.error(f"Raw ingestion error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _parse_data_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a client-supplied data_date (ISO format or YYYY-MM-DD)"""
+    if not value:
+        return None
+    return _parse_iso_date(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(value: str) -> datetime:
+    """
+    C-implemented ISO parse, cached since clients reuse the same few dates
+    fromisoformat already accepts YYYY-MM-DD, so no strptime fallback is needed
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
 @app.post("/ingest/file")
 async def ingest_file(file: UploadFile = File(...)):
     """
@@ -211,35 +561,111 @@ async def ingest_file(file: UploadFile = File(...)):
     Supports:
     - JSON array: [{"id": 1}, {"id": 2}]
     - JSONL: One JSON object per line
+
+    JSONL uploads are streamed in chunks and appended in batches of about
+    `UPLOAD_BATCH_SIZE` lines, each parsed by pyarrow's JSON reader, so
+    memory stays bounded by the batch size rather than the file size.
     """
     try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
+        first_chunk = await file.read(UPLOAD_CHUNK_SIZE)
 
-        # Try parsing as JSON array
-        try:
-            records = json.loads(content_str)
+        if _is_json_document(first_chunk):
+            # JSON array or pretty-printed object needs the whole document
+            records = orjson.loads(first_chunk + await file.read())
             if not isinstance(records, list):
                 records = [records]
-        except json.JSONDecodeError:
-            # Try JSONL format
-            records = []
-            for line in content_str.strip().split('\n'):
-                if line.strip():
-                    records.append(json.loads(line))
-
-        result = ingestion_engine.append_to_parquet(records)
-
-        if result["status"] == "error":
-            raise HTTPException(status_code=400, detail=result["message"])
+            result = await _ingest_upload(ingestion_engine.append_to_parquet, records)
+            response_cache.invalidate()
+            query_engine.notify_ingest("default")
+            return result
+
+        # JSONL: collect complete lines and hand each batch to the
+        # vectorized Arrow reader. Batches share open Parquet writers, so
+        # each file is rewritten once per upload rather than once per batch.
+        pending = first_chunk
+        batch = bytearray()
+        batch_lines = 0
+        result = None
+        total_processed = 0
+        batches = 0
+
+        session = ingestion_engine.session()
+        try:
+            chunk = first_chunk
+            while chunk:
+                cut = pending.rfind(b'\n') + 1
+                if cut:
+                    batch += pending[:cut]
+                    batch_lines += pending.count(b'\n', 0, cut)
+                    pending = pending[cut:]
+
+                if batch_lines >= UPLOAD_BATCH_SIZE:
+                    result = await _ingest_upload(
+                        ingestion_engine.append_jsonl, bytes(batch), session=session
+                    )
+                    total_processed += result["records_processed"]
+                    batches += 1
+                    batch = bytearray()
+                    batch_lines = 0
+
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                pending += chunk
+
+            batch += pending
+            if batch.strip() or result is None:
+                result = await _ingest_upload(
+                    ingestion_engine.append_jsonl, bytes(batch), session=session
+                )
+                total_processed += result["records_processed"]
+                batches += 1
+        finally:
+            # Finalize the upload's files, then drop results cached meanwhile
+            await run_blocking(session.close)
+            response_cache.invalidate()
+            query_engine.notify_ingest("default")
 
-        return result
+        return {
+            **result,
+            "records_processed": total_processed,
+            "batches": batches
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"File ingestion error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _is_json_document(first_chunk: bytes) -> bool:
+    """True if an upload is one JSON document rather than JSONL"""
+    stripped = first_chunk.lstrip()
+    if stripped[:1] == b'[':
+        return True
+
+    # A pretty-printed object spans lines, so its first line is not valid JSON
+    first_line, newline, _ = stripped.partition(b'\n')
+    if not newline:
+        return False
+    try:
+        orjson.loads(first_line)
+        return False
+    except orjson.JSONDecodeError:
+        return True
+
+
+async def _ingest_upload(append, payload, **kwargs) -> Dict[str, Any]:
+    """
+    Run one ingestion call for an upload, raising on ingestion errors
+    Callers refresh caches once the whole upload is in
+    """
+    result = await run_blocking(append, payload, **kwargs)
+
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+
 # ============================================================================
 # Query Endpoints
 # ============================================================================
@@ -250,6 +676,8 @@ async def query_sql(request: SQLQueryRequest):
     Execute raw SQL query
 
     Query against the `all_records` view which includes all Parquet files.
+    Only a single read-only SELECT statement is accepted, and results are
+    capped at `limit` (or MAX_QUERY_RESULTS) rows.
 
     Example:
     ```sql
@@ -259,13 +687,18 @@ async def query_sql(request: SQLQueryRequest):
     ```
     """
     try:
-        result = query_engine.execute_sql(request.query, request.limit)
+        async with db_pool.acquire() as cursor:
+            result = await run_blocking(
+                query_engine.execute_user_sql, request.query, request.limit, cursor=cursor
+            )
 
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
 
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"SQL query error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -275,7 +708,8 @@ async def query_sql(request: SQLQueryRequest):
 async def query_by_id(record_id: str):
     """Query record by ID"""
     try:
-        result = query_engine.query_by_id(record_id)
+        async with db_pool.acquire() as cursor:
+            result = await run_blocking(query_engine.query_by_id, record_id, cursor=cursor)
 
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
@@ -296,11 +730,15 @@ async def query_by_id(record_id: str):
 async def query_date_range(request: QueryByDateRequest):
     """Query records within date range"""
     try:
-        result = query_engine.query_by_date_range(
-            request.start_date,
-            request.end_date,
-            request.limit
-        )
+        async with db_pool.acquire() as cursor:
+            result = await run_blocking(
+                query_engine.query_by_date_range,
+                request.start_date,
+                request.end_date,
+                request.limit,
+                cursor=cursor,
+                columns=request.columns
+            )
 
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
@@ -315,11 +753,16 @@ async def query_date_range(request: QueryByDateRequest):
 @app.get("/query/recent")
 async def query_recent(
     hours: int = Query(default=24, ge=1, le=168),
-    limit: int = Query(default=100, le=10000)
+    limit: int = Query(default=100, le=10000),
+    columns: Optional[str] = Query(default=None, description="Comma-separated columns to return")
 ):
     """Query records from last N hours (default: 24)"""
     try:
-        result = query_engine.query_recent(hours, limit)
+        selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+        async with db_pool.acquire() as cursor:
+            result = await run_blocking(
+                query_engine.query_recent, hours, limit, cursor=cursor, columns=selected
+            )
 
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
@@ -337,19 +780,26 @@ async def search_records(request: SearchRequest):
     Full-text search across records
 
     Searches all text columns if no specific column provided.
+    Results are cached in-process for `SEARCH_CACHE_TTL` seconds.
     """
     try:
-        result = query_engine.search(
-            request.search_term,
-            request.column,
-            request.limit
-        )
+        async with db_pool.acquire() as cursor:
+            result = await run_blocking(
+                query_engine.search,
+                request.search_term,
+                request.column,
+                request.limit,
+                cursor=cursor,
+                columns=request.columns
+            )
 
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
 
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -360,25 +810,38 @@ async def search_records(request: SearchRequest):
 # ============================================================================
 
 @app.get("/files")
-async def list_files():
+async def list_files(nocache: bool = False):
     """List all Parquet files with metadata"""
+    cached = None if nocache else await response_cache.get("files", FILES_CACHE_TTL)
+    if cached is not None:
+        return cached
+
     try:
-        files = ingestion_engine.get_file_stats()
-        return {
+        files = await run_blocking(ingestion_engine.get_file_stats)
+        result = {
             "status": "success",
             "files": files,
             "total_files": len(files)
         }
+        await response_cache.set("files", result)
+        return result
     except Exception as e:
         logger.error(f"File list error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/schema")
-async def get_schema():
+async def get_schema(nocache: bool = False):
     """Get current data schema"""
+    cached = None if nocache else await response_cache.get("schema", SCHEMA_CACHE_TTL)
+    if cached is not None:
+        return cached
+
     try:
-        result = query_engine.execute_sql("DESCRIBE all_records")
+        async with db_pool.acquire() as cursor:
+            result = await run_blocking(
+                query_engine.execute_sql, "DESCRIBE all_records", cursor=cursor
+            )
 
         if result["status"] == "error":
             return {
@@ -386,10 +849,12 @@ async def get_schema():
                 "message": "No data ingested yet"
             }
 
-        return {
+        result = {
             "status": "success",
             "schema": result["data"]
         }
+        await response_cache.set("schema", result)
+        return result
     except Exception as e:
         logger.error(f"Schema error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -406,9 +871,12 @@ if __name__ == "__main__":
     logger.info(f"📍 API: http://{API_HOST}:{API_PORT}")
     logger.info(f"📚 Docs: http://{API_HOST}:{API_PORT}/docs")
 
+    # Multiple workers need an import string so each process builds its own app;
+    # uvicorn[standard] picks uvloop and httptools automatically
     uvicorn.run(
-        app,
+        "api:app" if API_WORKERS > 1 else app,
         host=API_HOST,
         port=API_PORT,
+        workers=API_WORKERS,
         log_level="info"
     )
@@ -18,12 +18,19 @@ LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Parquet settings
 COMPRESSION = 'zstd'  # Options: snappy, gzip, zstd, lz4
-ROW_GROUP_SIZE = 100000  # Rows per group for optimal performance
+ROW_GROUP_SIZE = 100000  # Max rows per group (wide rows are also capped by bytes below)
+COMPRESSION_LEVEL = 3  # zstd level: good ratio at low CPU cost (None for snappy)
+DATA_PAGE_SIZE = 1 << 20  # 1MB data pages
+DATA_PAGE_VERSION = '2.0'  # V2 pages store levels uncompressed, so readers skip decompressing them
+WRITE_STATISTICS = True  # Min/max stats let DuckDB skip row groups
+JSON_BLOCK_SIZE = 16 << 20  # Bytes per block when reading JSONL (pyarrow and orjson paths)
+APPEND_CHUNK_ROWS = 100000  # Large appends are normalized and written this many records at a time
 
 # Date-based partitioning (year/month/type_fromDay_toDay.parquet)
 PARTITION_BY_DATE_RANGE = True
 DATE_FIELD = 'data_date'  # The date from client (when data is for)
 INGESTED_AT_FIELD = 'ingested_at'  # When we received it
+INGESTED_HOUR_FIELD = 'ingested_hour'  # UTC hour of ingested_at (int8), for hour-of-day grouping
 ID_FIELD = 'record_id'
 TYPE_FIELD = 'data_type'  # Type of data from client
 
@@ -32,11 +39,41 @@ MAX_ROWS_PER_FILE = 100  # Maximum rows per file before creating new file
 # When file reaches limit, new file created starting from overflow date
 # Example: log_01_05.parquet (100 rows) → overflow on day 5 → create log_05_30.parquet
 
+# Byte-based sizing, so wide and narrow records give similar row groups/files
+TARGET_ROW_GROUP_BYTES = 128 * 1024 * 1024  # Uncompressed bytes per row group
+MAX_FILE_BYTES = 512 * 1024 * 1024  # Estimated on-disk bytes before rolling over
+
 # API settings
 API_HOST = "0.0.0.0"
 API_PORT = 8000
 API_TITLE = "DuckParqStream API"
 API_VERSION = "1.0.0"
+API_WORKERS = int(os.environ.get("API_WORKERS", 1))  # uvicorn worker processes
+
+# Upload streaming (/ingest/file)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read from the upload per chunk
+UPLOAD_BATCH_SIZE = 10000  # Records appended to Parquet per batch
+
+# HTTP compression
+GZIP_MIN_SIZE = 1024  # Responses at least this many bytes are gzipped for gzip clients
+MAX_DECOMPRESSED_BYTES = int(os.environ.get("MAX_DECOMPRESSED_BYTES", 1024 * 1024 * 1024))  # Largest request body accepted after decompression (413 beyond)
+
+# Ingest coalescing (/ingest): concurrent requests share one Parquet write
+FLUSH_ROWS = 10000  # Flush as soon as this many records are queued
+FLUSH_INTERVAL_MS = 50  # Longest a request waits for others to join its batch
+INGEST_QUEUE_SIZE = 1000  # Pending requests before /ingest applies backpressure
+
+# Response cache TTLs in seconds (cleared on every successful ingest)
+HEALTH_CACHE_TTL = 5
+STATISTICS_CACHE_TTL = 30
+FILES_CACHE_TTL = 30
+SCHEMA_CACHE_TTL = 300
+
+# Search result cache (/query/search)
+SEARCH_CACHE_SIZE = 256  # Distinct (term, column, limit) entries kept
+SEARCH_CACHE_TTL = 60  # Seconds
+FTS_ENABLED = False  # BM25 search via DuckDB's fts extension when it can be loaded (off: that path is not yet tested)
+FTS_REBUILD_DELAY = 0.5  # Seconds an index refresh waits so a burst of ingests shares it
 
 # Query limits
 MAX_QUERY_RESULTS = 10000
@@ -45,3 +82,14 @@ DEFAULT_LIMIT = 100
 # Performance tuning
 DUCKDB_MEMORY_LIMIT = "2GB"
 DUCKDB_THREADS = 4
+DUCKDB_PARQUET_METADATA_CACHE = True  # Keep parsed Parquet footers across queries (revalidated by mtime)
+DUCKDB_TEMP_DIRECTORY = BASE_DIR / "data" / "duckdb_tmp"  # Local spill space for sorts/joins over memory_limit
+
+# DuckDB holds the all_records view plus derived tables (id_index,
+# search_corpus) that are rebuilt from the Parquet files when missing.
+# Worker processes cannot share one database file lock, so with several
+# API workers each opens its own in-memory database instead. Each worker
+# then rebuilds the id index and search corpus from every Parquet file
+# at startup. Parquet writes from all workers (and scripts) are serialized
+# by a lock file in DATA_DIR.
+DUCKDB_DATABASE = ":memory:" if API_WORKERS > 1 else str(DUCKDB_FILE)
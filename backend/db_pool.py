@@ -0,0 +1,119 @@
+"""
+DuckDB connection pool for concurrent API access
+One base (write) connection plus N warm read cursors sharing its database
+"""
+import atexit
+import asyncio
+import threading
+import duckdb
+from contextlib import asynccontextmanager, contextmanager
+from typing import List
+import logging
+from config import (
+    DUCKDB_DATABASE, DUCKDB_MEMORY_LIMIT, DUCKDB_THREADS,
+    DUCKDB_PARQUET_METADATA_CACHE, DUCKDB_TEMP_DIRECTORY
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DuckDBPool:
+    """Bounded pool of DuckDB cursors cloned from a single base connection"""
+
+    def __init__(self, database: str = DUCKDB_DATABASE, size: int = DUCKDB_THREADS):
+        self.database = str(database)
+        self.size = max(1, size)
+
+        # Serializes catalog changes (view registration) on the base connection
+        self.write_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._available = threading.Semaphore(self.size)
+        self._free: List[duckdb.DuckDBPyConnection] = []
+        self._cursors: List[duckdb.DuckDBPyConnection] = []
+
+        self.connection = self._connect()
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        """Open the base connection and apply performance settings"""
+        try:
+            connection = duckdb.connect(self.database)
+
+            # Performance tuning (database-wide, inherited by every cursor)
+            connection.execute(f"SET memory_limit='{DUCKDB_MEMORY_LIMIT}'")
+            connection.execute(f"SET threads TO {DUCKDB_THREADS}")
+            connection.execute("SET enable_progress_bar=true")
+            # Results without ORDER BY may come back in any order, which lets
+            # parallel scans skip re-sequencing (ORDER BY is still honoured)
+            connection.execute("SET preserve_insertion_order=false")
+            # Repeated scans of the same files skip footer parsing
+            connection.execute(
+                f"SET parquet_metadata_cache={str(DUCKDB_PARQUET_METADATA_CACHE).lower()}"
+            )
+            temp_directory = str(DUCKDB_TEMP_DIRECTORY).replace("'", "''")
+            connection.execute(f"SET temp_directory='{temp_directory}'")
+
+            # Warm read cursors share the base connection's database and caches
+            for _ in range(self.size):
+                cursor = connection.cursor()
+                self._cursors.append(cursor)
+                self._free.append(cursor)
+
+            logger.info(f"✅ DuckDB connected: {self.database} (pool size {self.size})")
+            return connection
+
+        except Exception as e:
+            logger.error(f"❌ DuckDB connection failed: {e}")
+            raise
+
+    def get(self) -> duckdb.DuckDBPyConnection:
+        """Check out a cursor, blocking until one is free"""
+        self._available.acquire()
+        with self._lock:
+            return self._free.pop()
+
+    def put(self, cursor: duckdb.DuckDBPyConnection):
+        """Return a cursor to the pool"""
+        with self._lock:
+            self._free.append(cursor)
+        self._available.release()
+
+    @contextmanager
+    def cursor(self):
+        """Synchronous checkout for scripts and worker threads"""
+        cursor = self.get()
+        try:
+            yield cursor
+        finally:
+            self.put(cursor)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Asynchronous checkout for API endpoints"""
+        cursor = await asyncio.to_thread(self.get)
+        try:
+            yield cursor
+        finally:
+            self.put(cursor)
+
+    def close_all(self):
+        """Close every cursor and the base connection"""
+        with self._lock:
+            for cursor in self._cursors:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            self._cursors.clear()
+            self._free.clear()
+
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            logger.info("🔌 DuckDB connection closed")
+
+
+# Singleton instance
+db_pool = DuckDBPool()
+atexit.register(db_pool.close_all)
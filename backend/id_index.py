@@ -0,0 +1,132 @@
+"""
+Persistent record_id → Parquet location index
+Lets single-record lookups read one row group instead of scanning every file
+"""
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import List, Optional, Tuple
+import logging
+import threading
+from config import ID_FIELD, ROW_GROUP_SIZE
+from db_pool import DuckDBPool, db_pool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RecordIdIndex:
+    """DuckDB table mapping each record_id to its file and row group"""
+
+    def __init__(self, pool: DuckDBPool = db_pool):
+        self.pool = pool
+        # Own cursor on the pooled database: background refreshes then never
+        # share the base connection with queries run without a pool cursor
+        self._connection = pool.connection.cursor()
+        self._lock = threading.Lock()
+        self._create_table()
+
+    def _create_table(self):
+        """Create the index table; its primary key is backed by an ART index"""
+        with self._lock:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS id_index (
+                    record_id VARCHAR PRIMARY KEY,
+                    file_path VARCHAR,
+                    row_group INTEGER
+                )
+            """)
+
+    def add(
+        self,
+        file_path: Path,
+        record_ids: pa.Array,
+        first_row_group: int = 0,
+        row_group_size: int = ROW_GROUP_SIZE
+    ):
+        """
+        Record the location of rows just written to a Parquet file
+
+        Args:
+            file_path: File the rows were written to
+            record_ids: IDs in write order
+            first_row_group: Row group index the rows start at
+            row_group_size: Rows per row group used by the writer
+        """
+        if len(record_ids) == 0:
+            return
+
+        entries = pa.table({
+            'record_id': pc.cast(record_ids, pa.string()),
+            'file_path': pa.repeat(self._key(file_path), len(record_ids)),
+            'row_group': pa.array(
+                first_row_group + np.arange(len(record_ids)) // row_group_size,
+                pa.int32()
+            )
+        })
+
+        with self._lock:
+            self._connection.register('id_index_entries', entries)
+            try:
+                # A re-ingested ID points at its newest copy
+                self._connection.execute("""
+                    INSERT OR REPLACE INTO id_index
+                    SELECT DISTINCT ON (record_id) record_id, file_path, row_group
+                    FROM id_index_entries
+                    WHERE record_id IS NOT NULL
+                """)
+            finally:
+                self._connection.unregister('id_index_entries')
+
+    def rename_file(self, old_path: Path, new_path: Path):
+        """Follow a partition file rename (row groups are unchanged)"""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE id_index SET file_path = ? WHERE file_path = ?",
+                [self._key(new_path), self._key(old_path)]
+            )
+
+    def lookup(self, record_id: str, cursor=None) -> Optional[Tuple[Path, int]]:
+        """Point lookup of a record's (file, row group), None if unknown"""
+        query = "SELECT file_path, row_group FROM id_index WHERE record_id = ?"
+        if cursor is not None:
+            row = cursor.execute(query, [str(record_id)]).fetchone()
+        else:
+            with self._lock:
+                row = self._connection.execute(query, [str(record_id)]).fetchone()
+        return (Path(row[0]), row[1]) if row else None
+
+    def is_empty(self) -> bool:
+        """True if no IDs have been indexed yet"""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT NOT EXISTS (SELECT 1 FROM id_index)"
+            ).fetchone()[0]
+
+    def rebuild(self, files: List[Path]):
+        """Index existing Parquet files, reading only their ID column"""
+        indexed = 0
+        for file_path in files:
+            try:
+                with pq.ParquetFile(file_path) as parquet_file:
+                    if ID_FIELD not in parquet_file.schema_arrow.names:
+                        continue
+                    for index in range(parquet_file.num_row_groups):
+                        ids = parquet_file.read_row_group(index, columns=[ID_FIELD])[ID_FIELD]
+                        self.add(file_path, ids.combine_chunks(), first_row_group=index,
+                                 row_group_size=max(len(ids), 1))
+                        indexed += len(ids)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not index {file_path}: {e}")
+
+        logger.info(f"🗂️ Indexed {indexed} record IDs from {len(files)} file(s)")
+
+    def _key(self, file_path: Path) -> str:
+        """Stored form of a file path"""
+        return str(Path(file_path).resolve())
+
+
+# Singleton instance
+id_index = RecordIdIndex()
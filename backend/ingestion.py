@@ -2,36 +2,287 @@
 Core data ingestion module for JSON to Parquet conversion
 Handles weekly rotation and efficient append operations
 """
-import json
-import pandas as pd
+import asyncio
+import mmap
+import os
+import numpy as np
+import orjson
 import pyarrow.parquet as pq
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
+import threading
+import time
+import calendar
+import tempfile
+from functools import lru_cache
 from config import (
-    DATA_DIR, COMPRESSION, ROW_GROUP_SIZE,
-    DATE_FIELD, INGESTED_AT_FIELD, ID_FIELD, TYPE_FIELD,
-    PARTITION_BY_DATE_RANGE, MAX_ROWS_PER_FILE
+    DATA_DIR, COMPRESSION, COMPRESSION_LEVEL, ROW_GROUP_SIZE,
+    DATA_PAGE_SIZE, DATA_PAGE_VERSION, WRITE_STATISTICS, JSON_BLOCK_SIZE, APPEND_CHUNK_ROWS,
+    DATE_FIELD, INGESTED_AT_FIELD, INGESTED_HOUR_FIELD, ID_FIELD, TYPE_FIELD,
+    PARTITION_BY_DATE_RANGE, MAX_ROWS_PER_FILE, MAX_FILE_BYTES, TARGET_ROW_GROUP_BYTES,
+    FLUSH_ROWS, FLUSH_INTERVAL_MS, INGEST_QUEUE_SIZE
 )
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _timestamps_as_strings(data_type: pa.DataType) -> pa.DataType:
+    """Replace inferred timestamp types (also inside structs/lists) with string"""
+    if pa.types.is_timestamp(data_type):
+        return pa.string()
+    if pa.types.is_struct(data_type):
+        return pa.struct(
+            [field.with_type(_timestamps_as_strings(field.type)) for field in data_type]
+        )
+    if pa.types.is_list(data_type):
+        return pa.list_(data_type.value_field.with_type(
+            _timestamps_as_strings(data_type.value_type)
+        ))
+    return data_type
+
+
+@lru_cache(maxsize=None)
+def _last_day_of_month(year: int, month: int) -> int:
+    return calendar.monthrange(year, month)[1]
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Datetime from a timestamp statistic or an ISO date string"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return value
+
+
+def _flatten_records(records: List[Dict[str, Any]]) -> Dict[str, list]:
+    """
+    Flatten records into dotted-name column lists in one pass
+
+    Pure-Python counterpart of the Arrow struct flatten, used when the
+    records' types cannot be unified into a single struct type.
+    """
+    num_rows = len(records)
+    columns: Dict[str, list] = {}
+
+    def visit(value: Dict[str, Any], prefix: str, row: int):
+        for key, item in value.items():
+            name = prefix + key
+            if isinstance(item, dict) and item:
+                visit(item, name + '.', row)
+                continue
+            column = columns.get(name)
+            if column is None:
+                # Seeded lazily so keys missing from earlier rows stay null
+                column = columns[name] = [None] * num_rows
+            column[row] = item
+
+    for row, record in enumerate(records):
+        visit(record, '', row)
+    return columns
+
+
+def _column_array(values: list) -> pa.Array:
+    """Arrow array for a column, as JSON-encoded strings if its types conflict"""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array(
+            [
+                v if v is None or isinstance(v, str) else orjson.dumps(v).decode()
+                for v in values
+            ],
+            pa.string()
+        )
+
+
+# data_type sanitization tables: drop ASCII bytes that may not appear in a
+# file name prefix and lowercase the rest, in a single bytes.translate
+_UNSAFE_TYPE_BYTES = bytes(
+    c for c in range(128) if not (chr(c).isalnum() or chr(c) in '_-')
+)
+_LOWERCASE_BYTES = bytes.maketrans(
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz'
+)
+
+
+@lru_cache(maxsize=1024)
+def _safe_type(data_type: str) -> str:
+    """File-name-safe, lowercase form of a data_type ("default" if empty)"""
+    if data_type.isascii():
+        safe_type = data_type.encode('ascii').translate(
+            _LOWERCASE_BYTES, _UNSAFE_TYPE_BYTES
+        ).decode('ascii')
+    else:
+        safe_type = "".join(
+            c for c in data_type if c.isalnum() or c in ('_', '-')
+        ).lower()
+    return safe_type or "default"
+
+
+def _scan_parquet_files(directory: Path, prefix: str = "", recursive: bool = False) -> List[Path]:
+    """Parquet files in a directory via os.scandir (no stat per entry)"""
+    files = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if recursive and entry.is_dir():
+                    files.extend(_scan_parquet_files(Path(entry.path), prefix, recursive))
+                elif entry.name.startswith(prefix) and entry.name.endswith('.parquet'):
+                    files.append(Path(entry.path))
+    except FileNotFoundError:
+        pass
+    return files
+
+
+def _uuid4_strings(count: int) -> pa.Array:
+    """Random UUID4 strings for a whole batch, formatted with numpy"""
+    raw = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+
+    hex_chars = np.frombuffer(raw.tobytes().hex().encode(), dtype='S1').reshape(count, 32)
+    dash = np.full((count, 1), b'-', dtype='S1')
+    chars = np.hstack([
+        hex_chars[:, :8], dash, hex_chars[:, 8:12], dash,
+        hex_chars[:, 12:16], dash, hex_chars[:, 16:20], dash, hex_chars[:, 20:]
+    ])
+    return pa.array(chars.view('S36').ravel()).cast(pa.string())
+
+
+class ProcessWriteLock:
+    """
+    Exclusive lock on a lock file, held by this process as a whole
+
+    Other processes writing the same data directory (API workers, scripts)
+    wait for it; threads of this process share it and stay coordinated by
+    the engine's own locks. It is held while any thread of this process
+    is choosing, rewriting or renaming files, or keeps a writer open.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._mutex = threading.Lock()
+        self._holders = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self):
+        with self._mutex:
+            if self._holders == 0:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+                    else:
+                        while True:
+                            try:
+                                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                                break
+                            except OSError:
+                                # LK_LOCK gives up after ~10s; keep waiting
+                                continue
+                except BaseException:
+                    os.close(fd)
+                    raise
+                self._fd = fd
+            self._holders += 1
+
+    def release(self):
+        with self._mutex:
+            self._holders -= 1
+            if self._holders == 0:
+                fd, self._fd = self._fd, None
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    else:
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                finally:
+                    os.close(fd)
+
+    def __enter__(self) -> 'ProcessWriteLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class IngestSession:
+    """
+    Scope for a run of appends that share open Parquet writers
+
+    While a session is open, appends to the same file go to one open
+    ParquetWriter instead of rewriting the file each time. The file is
+    finalized when the session closes, when the file rotates, or when a
+    batch adds new columns. Rows written through an open writer become
+    visible to queries once it is finalized.
+    """
+
+    def __init__(self, engine: 'ParquetIngestionEngine'):
+        self.engine = engine
+        self.files: set = set()
+
+    def close(self):
+        """Finalize every file this session left open"""
+        self.engine._close_session(self)
+
+    def __enter__(self) -> 'IngestSession':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 class ParquetIngestionEngine:
     """Handles JSON ingestion with date-range based Parquet partitioning"""
 
     def __init__(self, data_dir: Path = DATA_DIR):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Serializes file changes with other processes writing data_dir
+        self._process_lock = ProcessWriteLock(self.data_dir / ".write.lock")
+        # _write_lock guards file selection and the in-memory indexes;
+        # per-file locks guard the writes, so different files encode in parallel
+        self._write_lock = threading.Lock()
+        self._file_locks: Dict[Path, threading.Lock] = {}
+        # target file -> open writer state, for files inside an IngestSession
+        self._open_writers: Dict[Path, Dict[str, Any]] = {}
+        # Moving average of on-disk bytes per in-memory Arrow byte
+        self._compression_ratio = 0.25
+        # path -> (mtime_ns, size, footer), so unchanged files are parsed once
+        self._footer_cache: Dict[Path, tuple] = {}
+        # (year/month dir, type) -> (dir mtime_ns, partition files), relisted
+        # only when the directory changes (e.g. another process wrote to it)
+        self._dir_index: Dict[tuple, Tuple[Optional[int], set]] = {}
+        # record_id index attached by the API process (see api.py); left
+        # unset elsewhere so importing the engine never opens DuckDB
+        self.id_index = None
+
+    def session(self) -> IngestSession:
+        """Start a session for many consecutive appends (bulk ingest, uploads)"""
+        return IngestSession(self)
 
     def find_or_create_file_for_date(
         self,
         data_date: datetime,
         data_type: str = "default",
-        new_record_count: int = 0
+        new_record_count: int = 0,
+        new_bytes: int = 0
     ) -> Path:
         """
         Find existing file that can accommodate this date or create new one
@@ -39,7 +290,8 @@ class ParquetIngestionEngine:
 
         Logic:
         1. Check existing files in year/month for this type
-        2. If file exists and has space (< MAX_ROWS_PER_FILE), return it
+        2. If file exists and has space (< MAX_ROWS_PER_FILE rows and
+           < MAX_FILE_BYTES estimated bytes), return it
         3. If file is full, create new file starting from this date
         4. Update previous file's end date to last record's date
 
@@ -47,32 +299,30 @@ class ParquetIngestionEngine:
         Example: log_01_05.parquet (100 rows, days 1-5)
                  → overflow → log_05_30.parquet (new file from day 5)
 
+        Call with _process_lock and _write_lock held (it may rename a file).
+
         Args:
             data_date: The date this data belongs to
             data_type: Type of data (log, event, transaction, etc.)
+            new_record_count: Rows about to be appended
+            new_bytes: Uncompressed Arrow size of those rows
 
         Returns:
             Path object for the parquet file
         """
-        import calendar
-
         year = data_date.year
         month = data_date.month
         day = data_date.day
 
-        # Create directory structure: year/month/
         year_month_dir = self.data_dir / str(year) / f"{month:02d}"
-        year_month_dir.mkdir(parents=True, exist_ok=True)
 
-        # Sanitize data_type
-        safe_type = "".join(c for c in data_type if c.isalnum() or c in ('_', '-')).lower()
-        if not safe_type:
-            safe_type = "default"
+        safe_type = _safe_type(data_type)
 
         # Find all existing files for this type in this month
-        existing_files = sorted(year_month_dir.glob(f"{safe_type}_*.parquet"))
+        # (including files a session is still writing)
+        existing_files = sorted(self._partition_files(year_month_dir, safe_type))
 
-        last_day_of_month = calendar.monthrange(year, month)[1]
+        last_day_of_month = _last_day_of_month(year, month)
 
         # Check if we can use an existing file
         for file_path in existing_files:
@@ -85,36 +335,55 @@ class ParquetIngestionEngine:
 
                     # Check if this date falls in this file's range
                     if from_day <= day <= to_day:
-                        # Check if file has space
-                        try:
-                            existing_table = pq.read_table(file_path)
-                            current_rows = existing_table.num_rows
-
-                            # Check if adding new records would exceed limit
-                            if current_rows + new_record_count <= MAX_ROWS_PER_FILE:
-                                # File has space
-                                return file_path
-                            else:
-                                # File is full - need to create new file
-                                # Get the last date in current file
-                                df = existing_table.to_pandas()
-                                if DATE_FIELD in df.columns:
-                                    last_date_in_file = pd.to_datetime(df[DATE_FIELD]).max()
-                                    actual_last_day = last_date_in_file.day
-
-                                    # Rename current file to actual range
-                                    new_name = f"{safe_type}_{from_day:02d}_{actual_last_day:02d}.parquet"
-                                    new_path = file_path.parent / new_name
-                                    if file_path != new_path:
-                                        file_path.rename(new_path)
-                                        logger.info(f"Renamed {file_path.name} → {new_name}")
-
-                                    # Create new file starting from current day
-                                    new_file = year_month_dir / f"{safe_type}_{day:02d}_{last_day_of_month:02d}.parquet"
-                                    return new_file
-                        except Exception as e:
-                            logger.warning(f"Error reading {file_path}: {e}")
-                            continue
+                        # Wait for any in-flight write to this file before inspecting it
+                        with self._file_lock(file_path):
+                            open_writer = self._open_writers.get(file_path)
+                            if open_writer is not None:
+                                if self._has_space(
+                                    open_writer["rows"], open_writer["temp_file"].stat().st_size,
+                                    new_record_count, new_bytes
+                                ):
+                                    return file_path
+                                # Full: finalize it so the checks below see every row
+                                self._close_writer(file_path)
+
+                            # Check if file has space (footer only, no column data)
+                            try:
+                                current_rows = self._footer(file_path).num_rows
+                                current_size = self._footer_cache[file_path][1]
+
+                                # Check if adding new records would exceed limit
+                                if self._has_space(current_rows, current_size, new_record_count, new_bytes):
+                                    # File has space
+                                    return file_path
+                                else:
+                                    # File is full - need to create new file
+                                    # Get the last date in current file
+                                    last_date_in_file = self._last_date(file_path)
+                                    if last_date_in_file is not None:
+                                        actual_last_day = last_date_in_file.day
+
+                                        # Rename current file to actual range
+                                        new_name = f"{safe_type}_{from_day:02d}_{actual_last_day:02d}.parquet"
+                                        new_path = file_path.parent / new_name
+                                        if file_path != new_path:
+                                            file_path.rename(new_path)
+                                            if self.id_index is not None:
+                                                self.id_index.rename_file(file_path, new_path)
+                                            self._unregister_file(file_path)
+                                            self._register_file(new_path, safe_type)
+                                            logger.info(f"Renamed {file_path.name} → {new_name}")
+
+                                        # Create new file starting from current day
+                                        new_file = year_month_dir / f"{safe_type}_{day:02d}_{last_day_of_month:02d}.parquet"
+                                        return new_file
+                            except FileNotFoundError:
+                                # Removed outside this engine
+                                self._unregister_file(file_path)
+                                continue
+                            except Exception as e:
+                                logger.warning(f"Error reading {file_path}: {e}")
+                                continue
 
                 except (ValueError, IndexError):
                     continue
@@ -124,61 +393,280 @@ class ParquetIngestionEngine:
         new_file = year_month_dir / f"{safe_type}_{day:02d}_{last_day_of_month:02d}.parquet"
         return new_file
 
+    def _file_lock(self, file_path: Path) -> threading.Lock:
+        """Lock serializing writes to one file (call with _write_lock held)"""
+        lock = self._file_locks.get(file_path)
+        if lock is None:
+            lock = self._file_locks[file_path] = threading.Lock()
+        return lock
+
+    def _partition_files(self, year_month_dir: Path, safe_type: str) -> set:
+        """Partition files for a month and type, relisted when the directory's mtime changes"""
+        key = (year_month_dir, safe_type)
+        try:
+            mtime = year_month_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        cached = self._dir_index.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        files = {
+            path for path in _scan_parquet_files(year_month_dir, f"{safe_type}_")
+            if self._file_type(path) == safe_type
+        }
+        if cached is not None:
+            # Targets registered by this engine but not on disk yet
+            files.update(path for path in cached[1] if self._in_flight(path))
+        self._dir_index[key] = (mtime, files)
+        return files
+
+    def _in_flight(self, file_path: Path) -> bool:
+        """True while a session writer is open on file_path or a write to it is running"""
+        lock = self._file_locks.get(file_path)
+        return file_path in self._open_writers or (lock is not None and lock.locked())
+
+    def _file_type(self, file_path: Path) -> str:
+        """Type prefix of a type_fromDay_toDay.parquet name"""
+        return file_path.stem.rsplit('_', 2)[0]
+
+    def _register_file(self, file_path: Path, safe_type: Optional[str] = None):
+        """Record a partition file this engine created or renamed"""
+        if safe_type is None:
+            safe_type = self._file_type(file_path)
+        self._partition_files(file_path.parent, safe_type).add(file_path)
+
+    def _unregister_file(self, file_path: Path):
+        for _, files in self._dir_index.values():
+            files.discard(file_path)
+        self._footer_cache.pop(file_path, None)
+
+    def refresh_file_index(self):
+        """Forget cached listings, e.g. after files were changed externally"""
+        with self._write_lock:
+            self._dir_index.clear()
+            self._footer_cache.clear()
+
+    def _footer(self, file_path: Path) -> pq.FileMetaData:
+        """Parquet footer of a file, cached until the file changes"""
+        stat = file_path.stat()
+        cached = self._footer_cache.get(file_path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        metadata = pq.read_metadata(file_path)
+        self._footer_cache[file_path] = (stat.st_mtime_ns, stat.st_size, metadata)
+        return metadata
+
+    def _last_date(self, file_path: Path) -> Optional[datetime]:
+        """Latest DATE_FIELD value, from row group statistics when present"""
+        metadata = self._footer(file_path)
+        column_index = next(
+            (i for i in range(metadata.num_columns)
+             if metadata.schema.column(i).path == DATE_FIELD),
+            None
+        )
+        if column_index is None:
+            return None
+
+        maxima = []
+        for index in range(metadata.num_row_groups):
+            statistics = metadata.row_group(index).column(column_index).statistics
+            if statistics is None or not statistics.has_min_max:
+                # Stats missing: decode just this one column
+                column = pq.read_table(file_path, columns=[DATE_FIELD])[DATE_FIELD]
+                return _as_datetime(pc.max(column).as_py())
+            maxima.append(_as_datetime(statistics.max))
+
+        maxima = [value for value in maxima if value is not None]
+        return max(maxima) if maxima else None
+
+    def _has_space(
+        self,
+        current_rows: int,
+        current_size: int,
+        new_record_count: int,
+        new_bytes: int
+    ) -> bool:
+        """True if a file stays within the row and byte limits after an append"""
+        if current_rows + new_record_count > MAX_ROWS_PER_FILE:
+            return False
+        estimated_size = current_size + new_bytes * self._compression_ratio
+        return estimated_size <= MAX_FILE_BYTES
+
+    def _row_group_rows(self, table: pa.Table) -> int:
+        """Rows per row group so each holds about TARGET_ROW_GROUP_BYTES"""
+        if table.num_rows == 0:
+            return ROW_GROUP_SIZE
+        avg_row_bytes = max(1, table.nbytes // table.num_rows)
+        return max(1, min(ROW_GROUP_SIZE, TARGET_ROW_GROUP_BYTES // avg_row_bytes))
+
     def normalize_json_record(
         self,
         record: Dict[str, Any],
         data_date: Optional[datetime] = None,
-        data_type: Optional[str] = None
-    ) -> pd.DataFrame:
+        data_type: Optional[str] = None,
+        now: Optional[datetime] = None,
+        schema: Optional[pa.Schema] = None
+    ) -> pa.Table:
         """
         Normalize nested JSON to flat structure
         Adds metadata fields for tracking
 
+        Builds the Arrow table column-wise from the records directly,
+        without a pandas intermediate. Nested objects are flattened to
+        dotted column names (e.g. ``metadata.ip_address``).
+
         Args:
             record: JSON record(s) to normalize
             data_date: The date this data belongs to (from client)
             data_type: Type of data (from client)
+            now: Ingestion time to stamp (defaults to the current time)
+            schema: Schema of the records, used instead of inferring one
         """
         # Handle both single record and list
         if not isinstance(record, list):
             record = [record]
 
-        # Flatten nested structures
-        df = pd.json_normalize(record)
+        if not record:
+            return pa.table({})
+
+        table = self._records_table(record, schema)
+        return self._add_metadata_columns(table, data_date, data_type, now)
+
+    def _records_table(
+        self,
+        records: List[Dict[str, Any]],
+        schema: Optional[pa.Schema] = None
+    ) -> pa.Table:
+        """Flat Arrow table of JSON records, without the metadata columns"""
+        if schema is not None:
+            # Caller-supplied types: no inference pass over the records
+            return self._flatten(pa.Table.from_pylist(records, schema=schema))
+
+        try:
+            # Infer one struct type over all records (union of keys)
+            return self._flatten(pa.Table.from_struct_array(pa.array(records)))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # A field changes type between records: build columns individually
+            columns = _flatten_records(records)
+            return pa.Table.from_pydict(
+                {name: _column_array(values) for name, values in columns.items()}
+            )
+
+    def _flatten(self, table: pa.Table) -> pa.Table:
+        """Flatten nested structs until only leaf columns remain"""
+        while any(pa.types.is_struct(field.type) for field in table.schema):
+            table = table.flatten()
+        return table
+
+    def _add_metadata_columns(
+        self,
+        table: pa.Table,
+        data_date: Optional[datetime] = None,
+        data_type: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> pa.Table:
+        """Stamp data_date, ingested_at/ingested_hour, data_type and record_id columns"""
+        num_rows = table.num_rows
+        now = now or datetime.now(timezone.utc)
+        # Stored once per batch so hour-of-day queries group on a small int
+        # instead of running EXTRACT(HOUR ...) on every row
+        hour = pa.scalar(now.astimezone(timezone.utc).hour, pa.int8())
+        # One timestamp per batch, broadcast in C++ rather than per row
+        now = pa.scalar(now)
+
+        def set_constant(table: pa.Table, name: str, value) -> pa.Table:
+            array = pa.repeat(value, num_rows)
+            index = table.schema.get_field_index(name)
+            if index >= 0:
+                return table.set_column(index, name, array)
+            return table.append_column(name, array)
 
         # Add data_date (the date this data is FOR)
         if data_date:
-            df[DATE_FIELD] = data_date
-        elif DATE_FIELD not in df.columns:
+            table = set_constant(table, DATE_FIELD, data_date)
+        elif DATE_FIELD not in table.column_names:
             # If client didn't provide date, use current date
-            df[DATE_FIELD] = datetime.now(timezone.utc)
+            table = set_constant(table, DATE_FIELD, now)
 
         # Add ingested_at (when WE received it)
-        df[INGESTED_AT_FIELD] = datetime.now(timezone.utc)
+        table = set_constant(table, INGESTED_AT_FIELD, now)
+        table = set_constant(table, INGESTED_HOUR_FIELD, hour)
 
         # Add data_type
         if data_type:
-            df[TYPE_FIELD] = data_type
-        elif TYPE_FIELD not in df.columns:
-            df[TYPE_FIELD] = 'default'
+            table = set_constant(table, TYPE_FIELD, data_type)
+        elif TYPE_FIELD not in table.column_names:
+            table = set_constant(table, TYPE_FIELD, 'default')
 
         # Ensure ID field exists
-        if ID_FIELD not in df.columns:
-            if 'id' in df.columns:
-                df[ID_FIELD] = df['id']
+        if ID_FIELD not in table.column_names:
+            if 'id' in table.column_names:
+                table = table.append_column(ID_FIELD, self._fill_missing_ids(table.column('id')))
             else:
                 # Generate UUID if no ID present
-                import uuid
-                df[ID_FIELD] = [str(uuid.uuid4()) for _ in range(len(df))]
+                table = table.append_column(ID_FIELD, _uuid4_strings(num_rows))
+
+        return table
+
+    def _fill_missing_ids(self, ids: pa.ChunkedArray) -> pa.ChunkedArray:
+        """Give records without an id a UUID, generated in one batch"""
+        if ids.null_count == 0:
+            return ids
+        ids = pc.cast(ids.combine_chunks(), pa.string())
+        return pa.chunked_array([
+            pc.replace_with_mask(ids, pc.is_null(ids), _uuid4_strings(ids.null_count))
+        ])
+
+    def read_jsonl_table(self, source: Union[Path, bytes]) -> pa.Table:
+        """
+        Parse JSONL into a flat Arrow table with pyarrow's C++ reader
+
+        pyarrow infers ISO-looking strings as timestamps, while JSON records
+        sent to /ingest keep them as strings. To give both paths the same
+        column types, such fields are re-read with an explicit string type.
+
+        Args:
+            source: Path to a JSONL file, or JSONL bytes
 
-        return df
+        Raises:
+            pa.ArrowInvalid: if the input is not JSONL with consistent types
+        """
+        def open_source():
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                return pa.BufferReader(source)
+            # Parse straight from the page cache; a re-read is copy-free
+            return pa.memory_map(str(source))
+
+        read_options = pa_json.ReadOptions(block_size=JSON_BLOCK_SIZE)
+        table = pa_json.read_json(open_source(), read_options=read_options)
+
+        string_schema = pa.schema(
+            [field.with_type(_timestamps_as_strings(field.type)) for field in table.schema]
+        )
+        if not string_schema.equals(table.schema):
+            table = pa_json.read_json(
+                open_source(),
+                read_options=read_options,
+                parse_options=pa_json.ParseOptions(
+                    explicit_schema=string_schema,
+                    unexpected_field_behavior="infer"
+                )
+            )
+
+        return self._flatten(table)
 
     def append_to_parquet(
         self,
         records: List[Dict[str, Any]],
         data_date: Optional[datetime] = None,
         data_type: str = "default",
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        session: Optional[IngestSession] = None,
+        *,
+        schema: Optional[pa.Schema] = None
     ) -> Dict[str, Any]:
         """
         Append JSON records to date-range partitioned Parquet file
@@ -188,86 +676,111 @@ class ParquetIngestionEngine:
             data_date: The date this data belongs to (from client)
             data_type: Type of data (log, event, transaction, etc.)
             batch_size: Number of records to batch before writing
+            session: Keep the target file's writer open across calls
+            schema: Known record schema; skips type inference (reuse one
+                    schema across appends of the same record shape)
 
         Returns:
             Status dictionary with ingestion metrics
         """
         try:
-            start_time = datetime.now(timezone.utc)
+            start_time = time.perf_counter()
+            # One clock read per batch: data_date default, ingested_at, response
+            now = datetime.now(timezone.utc)
 
             # Use current date if not provided
             if data_date is None:
-                data_date = datetime.now(timezone.utc)
+                data_date = now
+
+            if isinstance(records, list) and len(records) > APPEND_CHUNK_ROWS:
+                return self._append_in_chunks(
+                    records, data_date, data_type, session, start_time, schema
+                )
 
             # Normalize records with date and type
-            df = self.normalize_json_record(records, data_date, data_type)
+            table = self.normalize_json_record(records, data_date, data_type, now, schema)
 
-            if df.empty:
-                return {
-                    "status": "error",
-                    "message": "No valid records to ingest",
-                    "records_processed": 0
-                }
+            return self._write_partitioned(table, data_date, data_type, start_time, session, now)
 
-            # Get target file based on date, type, and size limits
-            target_file = self.find_or_create_file_for_date(data_date, data_type, len(df))
-
-            # Convert to Arrow table
-            table = pa.Table.from_pandas(df)
-
-            # Append or create
-            if target_file.exists():
-                # Read existing and append with schema unification
-                existing = pq.read_table(target_file)
-
-                # Unify schemas by adding missing columns as null
-                existing_schema = existing.schema
-                new_schema = table.schema
-
-                # Get all unique column names
-                all_columns = set(existing_schema.names) | set(new_schema.names)
-
-                # Add missing columns to existing table
-                for col in new_schema.names:
-                    if col not in existing_schema.names:
-                        # Add null column with correct type
-                        null_array = pa.nulls(len(existing), type=table.schema.field(col).type)
-                        existing = existing.append_column(col, null_array)
-
-                # Add missing columns to new table
-                for col in existing_schema.names:
-                    if col not in new_schema.names:
-                        # Add null column with correct type
-                        null_array = pa.nulls(len(table), type=existing.schema.field(col).type)
-                        table = table.append_column(col, null_array)
-
-                # Now concat with unified schemas
-                table = pa.concat_tables([existing, table], promote=True)
-
-            # Write with compression
-            pq.write_table(
-                table,
-                target_file,
-                compression=COMPRESSION,
-                row_group_size=ROW_GROUP_SIZE
-            )
+        except Exception as e:
+            logger.error(f"❌ Ingestion failed: {str(e)}")
+            return {
+                "status": "error",
+                "message": str(e),
+                "records_processed": 0
+            }
 
-            duration = (datetime.now(timezone.utc) - start_time).total_seconds()
-            file_size = target_file.stat().st_size / (1024 * 1024)  # MB
+    def _append_in_chunks(
+        self,
+        records: List[Dict[str, Any]],
+        data_date: datetime,
+        data_type: str,
+        session: Optional[IngestSession],
+        start_time: float,
+        schema: Optional[pa.Schema] = None
+    ) -> Dict[str, Any]:
+        """
+        Append a large batch APPEND_CHUNK_ROWS records at a time
 
-            logger.info(
-                f"✅ Ingested {len(df)} records to {target_file.name} "
-                f"({file_size:.2f}MB) in {duration:.2f}s"
-            )
+        Only one chunk is held as Arrow data at a time, so memory stays
+        bounded by the chunk size. The chunks share an open writer, so the
+        target file is still rewritten once rather than once per chunk.
+        """
+        own_session = session is None
+        if own_session:
+            session = self.session()
 
-            return {
-                "status": "success",
-                "records_processed": len(df),
-                "file": str(target_file.name),
-                "file_size_mb": round(file_size, 2),
-                "duration_seconds": round(duration, 2),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
+        records_processed = 0
+        try:
+            for offset in range(0, len(records), APPEND_CHUNK_ROWS):
+                result = self.append_to_parquet(
+                    records[offset:offset + APPEND_CHUNK_ROWS], data_date, data_type,
+                    session=session, schema=schema
+                )
+                if result["status"] == "error":
+                    return {**result, "records_processed": records_processed}
+                records_processed += result["records_processed"]
+        finally:
+            if own_session:
+                session.close()
+
+        return {
+            **result,
+            "records_processed": records_processed,
+            "duration_seconds": round(time.perf_counter() - start_time, 2)
+        }
+
+    def append_table(
+        self,
+        table: pa.Table,
+        data_date: Optional[datetime] = None,
+        data_type: str = "default",
+        session: Optional[IngestSession] = None
+    ) -> Dict[str, Any]:
+        """
+        Append an already-parsed Arrow table (e.g. from read_jsonl_table)
+
+        Args:
+            table: Records as an Arrow table; nested structs are flattened
+            data_date: The date this data belongs to (from client)
+            data_type: Type of data (log, event, transaction, etc.)
+            session: Keep the target file's writer open across calls
+
+        Returns:
+            Status dictionary with ingestion metrics
+        """
+        try:
+            start_time = time.perf_counter()
+            # One clock read per batch: data_date default, ingested_at, response
+            now = datetime.now(timezone.utc)
+
+            # Use current date if not provided
+            if data_date is None:
+                data_date = now
+
+            table = self._add_metadata_columns(self._flatten(table), data_date, data_type, now)
+
+            return self._write_partitioned(table, data_date, data_type, start_time, session, now)
 
         except Exception as e:
             logger.error(f"❌ Ingestion failed: {str(e)}")
@@ -277,28 +790,559 @@ class ParquetIngestionEngine:
                 "records_processed": 0
             }
 
-    def get_file_stats(self) -> List[Dict[str, Any]]:
-        """Get statistics for all Parquet files"""
-        stats = []
+    def append_many(
+        self,
+        batches: List[Tuple[pa.Table, Optional[datetime], str]],
+        session: Optional[IngestSession] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Append several Arrow tables through one session
+
+        Batches are grouped by partition (year, month, data_type). Each run
+        starts at the file find_or_create_file_for_date picks for its first
+        batch. Later batches of the group join the run while their day is in
+        that file's range and the file's current rows and size plus the run
+        stay within the limits. Each run is then appended with one write, so
+        every batch lands in the file appending them one at a time would use.
+
+        Args:
+            batches: (table, data_date, data_type) tuples
+            session: Caller's session to use (default: one opened for the call)
+
+        Returns:
+            One status dictionary per batch, in the order given
+        """
+        if session is None:
+            with self.session() as own_session:
+                return self.append_many(batches, session=own_session)
+
+        # Runs are sized against files picked up front, so other processes
+        # must not change them until the runs are written
+        with self._process_lock:
+            return self._append_runs(batches, session)
 
-        for file_path in sorted(self.data_dir.glob("*.parquet")):
+    def _append_runs(
+        self,
+        batches: List[Tuple[pa.Table, Optional[datetime], str]],
+        session: IngestSession
+    ) -> List[Dict[str, Any]]:
+        """Group batches into runs per partition file and write each run once"""
+        start_time = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batches)
+
+        def write_run(run: Dict[str, Any]):
+            tables = [entry[1] for entry in run["batches"]]
             try:
-                table = pq.read_table(file_path)
-                file_size = file_path.stat().st_size / (1024 * 1024)
-
-                stats.append({
-                    "filename": file_path.name,
-                    "row_count": table.num_rows,
-                    "file_size_mb": round(file_size, 2),
-                    "columns": table.column_names,
-                    "modified": datetime.fromtimestamp(
-                        file_path.stat().st_mtime
-                    ).isoformat()
-                })
+                table = tables[0] if len(tables) == 1 else pa.concat_tables(
+                    tables, promote_options='permissive'
+                )
+                first_date, data_type = run["batches"][0][2:]
+                result = self._write_partitioned(
+                    table, first_date, data_type, start_time, session, now,
+                    target_file=run["file"]
+                )
             except Exception as e:
-                logger.error(f"Error reading {file_path}: {e}")
+                logger.error(f"❌ Ingestion failed: {str(e)}")
+                result = {"status": "error", "message": str(e), "records_processed": 0}
+
+            for index, table, _, _ in run["batches"]:
+                records = table.num_rows if result["status"] == "success" else 0
+                results[index] = {**result, "records_processed": records}
+
+        # Open run per partition, kept in the order the runs were started
+        open_runs: Dict[Tuple[int, int, str], Dict[str, Any]] = {}
+        for index, (table, data_date, data_type) in enumerate(batches):
+            data_date = data_date or now
+            try:
+                table = self._add_metadata_columns(self._flatten(table), data_date, data_type, now)
+                if table.num_rows == 0:
+                    results[index] = {
+                        "status": "error",
+                        "message": "No valid records to ingest",
+                        "records_processed": 0
+                    }
+                    continue
+
+                key = (data_date.year, data_date.month, _safe_type(data_type))
+                run = open_runs.get(key)
+                if run is not None and not (
+                    run["days"][0] <= data_date.day <= run["days"][1]
+                    and self._has_space(
+                        run["file_rows"], run["file_bytes"],
+                        run["rows"] + table.num_rows, run["bytes"] + table.nbytes
+                    )
+                ):
+                    # The next run's file depends on what this one wrote
+                    write_run(open_runs.pop(key))
+                    run = None
+                if run is None:
+                    run = open_runs[key] = self._start_run(table, data_date, data_type)
+            except Exception as e:
+                logger.error(f"❌ Ingestion failed: {str(e)}")
+                results[index] = {"status": "error", "message": str(e), "records_processed": 0}
+                continue
+
+            run["batches"].append((index, table, data_date, data_type))
+            run["rows"] += table.num_rows
+            run["bytes"] += table.nbytes
 
-        return stats
+        for run in open_runs.values():
+            write_run(run)
+
+        return results
+
+    def _start_run(self, table: pa.Table, data_date: datetime, data_type: str) -> Dict[str, Any]:
+        """Pick the file for an append_many run and read how full it already is"""
+        with self._write_lock:
+            target_file = self.find_or_create_file_for_date(
+                data_date, data_type, table.num_rows, table.nbytes
+            )
+            with self._file_lock(target_file):
+                open_writer = self._open_writers.get(target_file)
+                if open_writer is not None:
+                    file_rows = open_writer["rows"]
+                    file_bytes = open_writer["temp_file"].stat().st_size
+                elif target_file.exists():
+                    file_rows = self._footer(target_file).num_rows
+                    file_bytes = target_file.stat().st_size
+                else:
+                    file_rows = file_bytes = 0
+
+        from_day, to_day = target_file.stem.rsplit('_', 2)[1:]
+        return {
+            "file": target_file,
+            "days": (int(from_day), int(to_day)),
+            "file_rows": file_rows,
+            "file_bytes": file_bytes,
+            "rows": 0,
+            "bytes": 0,
+            "batches": []
+        }
+
+    def append_jsonl(
+        self,
+        data: bytes,
+        data_date: Optional[datetime] = None,
+        data_type: str = "default",
+        session: Optional[IngestSession] = None
+    ) -> Dict[str, Any]:
+        """
+        Append a block of JSONL bytes
+
+        Parsed with the vectorized Arrow reader; falls back to per-line
+        parsing when pyarrow cannot (e.g. a field changes type between lines).
+        """
+        try:
+            table = self.read_jsonl_table(data)
+        except pa.ArrowInvalid:
+            try:
+                records = [orjson.loads(line) for line in data.splitlines() if line.strip()]
+            except orjson.JSONDecodeError as e:
+                return {
+                    "status": "error",
+                    "message": f"Invalid JSONL: {e}",
+                    "records_processed": 0
+                }
+            return self.append_to_parquet(records, data_date, data_type, session=session)
+
+        return self.append_table(table, data_date, data_type, session)
+
+    def _write_partitioned(
+        self,
+        table: pa.Table,
+        data_date: datetime,
+        data_type: str,
+        start_time: float,
+        session: Optional[IngestSession] = None,
+        now: Optional[datetime] = None,
+        target_file: Optional[Path] = None
+    ) -> Dict[str, Any]:
+        """Write a normalized table into its date-range partition file (or target_file)"""
+        if table.num_rows == 0:
+            return {
+                "status": "error",
+                "message": "No valid records to ingest",
+                "records_processed": 0
+            }
+
+        # Choose the file under the engine lock, then hold only that file's
+        # lock while encoding, so appends to different files run in parallel
+        # (pyarrow releases the GIL) while appends to one file never interleave
+        # Other processes must not pick, rewrite or rename files meanwhile
+        with self._process_lock:
+            with self._write_lock:
+                # Get target file based on date, type, and size limits
+                if target_file is None:
+                    target_file = self.find_or_create_file_for_date(
+                        data_date, data_type, table.num_rows, table.nbytes
+                    )
+                self._register_file(target_file)
+                file_lock = self._file_lock(target_file)
+                file_lock.acquire()
+
+            try:
+                records_processed = table.num_rows
+                row_group_size = self._row_group_rows(table)
+                size_before = self._written_size(target_file)
+
+                # Append to an open writer, open one for the session, or rewrite
+                first_row_group = self._write_to_open_writer(target_file, table, row_group_size)
+                if first_row_group is None:
+                    if session is not None:
+                        first_row_group = self._open_writer(target_file, table, session, row_group_size)
+                    elif target_file.exists():
+                        first_row_group = self._append_row_groups(target_file, table, row_group_size)
+                    else:
+                        # Write with compression, swapped in so readers never see a partial file
+                        first_row_group = 0
+                        temp_file = self._temp_path(target_file)
+                        try:
+                            pq.write_table(
+                                table,
+                                temp_file,
+                                row_group_size=row_group_size,
+                                **self._writer_options(table.schema)
+                            )
+                        except Exception:
+                            temp_file.unlink(missing_ok=True)
+                            raise
+                        temp_file.replace(target_file)
+
+                self._index_record_ids(target_file, table, first_row_group, row_group_size)
+
+                # Measured before releasing the lock; a rotation may rename the file
+                size_after = self._written_size(target_file)
+                self._observe_compression(size_after - size_before, table.nbytes)
+            finally:
+                file_lock.release()
+
+        duration = time.perf_counter() - start_time
+        file_size = size_after / (1024 * 1024)  # MB
+
+        logger.info(
+            f"✅ Ingested {records_processed} records to {target_file.name} "
+            f"({file_size:.2f}MB) in {duration:.2f}s"
+        )
+
+        return {
+            "status": "success",
+            "records_processed": records_processed,
+            "file": str(target_file.name),
+            "file_size_mb": round(file_size, 2),
+            "duration_seconds": round(duration, 2),
+            "timestamp": (now or datetime.now(timezone.utc)).isoformat()
+        }
+
+    def _written_size(self, target_file: Path) -> int:
+        """Bytes written so far for a target (its open temp file if any)"""
+        open_writer = self._open_writers.get(target_file)
+        path = open_writer["temp_file"] if open_writer else target_file
+        return path.stat().st_size if path.exists() else 0
+
+    def _observe_compression(self, written_bytes: int, arrow_bytes: int):
+        """Fold one write's on-disk/in-memory ratio into the moving average"""
+        if written_bytes <= 0 or arrow_bytes <= 0:
+            return
+        observed = min(written_bytes / arrow_bytes, 1.5)
+        self._compression_ratio = 0.8 * self._compression_ratio + 0.2 * observed
+
+    def _append_row_groups(
+        self,
+        target_file: Path,
+        table: pa.Table,
+        row_group_size: int = ROW_GROUP_SIZE
+    ) -> int:
+        """
+        Append a table to an existing Parquet file
+
+        Parquet footers cannot be extended in place, so existing row groups
+        are streamed one at a time into a temporary file followed by the new
+        rows, which is then swapped in atomically. Memory use is bounded by
+        one row group instead of the whole file, and readers never observe
+        a partially written file.
+
+        Returns:
+            Index of the first row group holding the new rows
+        """
+        writer, temp_file, schema, first_row_group = self._start_rewrite(
+            target_file, table, row_group_size
+        )
+        try:
+            writer.close()
+        except Exception:
+            temp_file.unlink(missing_ok=True)
+            raise
+
+        temp_file.replace(target_file)
+        return first_row_group
+
+    def _temp_path(self, target_file: Path) -> Path:
+        """New temp file beside target_file, unique to this writer and process"""
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(
+            prefix=target_file.name + '.', suffix='.tmp', dir=target_file.parent
+        )
+        os.close(fd)
+        return Path(name)
+
+    def _start_rewrite(
+        self,
+        target_file: Path,
+        table: pa.Table,
+        row_group_size: int = ROW_GROUP_SIZE
+    ) -> tuple:
+        """
+        Open a writer on a temp file holding the target's rows plus `table`
+
+        Returns:
+            (writer, temp_file, schema, index of the first new row group)
+        """
+        temp_file = self._temp_path(target_file)
+        schema = table.schema
+        existing = None
+        existing_matches = True
+        if target_file.exists():
+            # Schema checks use the cached footer; row data is only read
+            # below, while copying it into the new file
+            metadata = self._footer(target_file)
+            existing = pq.ParquetFile(target_file, metadata=metadata)
+            existing_schema = metadata.schema.to_arrow_schema().remove_metadata()
+            if not existing_schema.equals(table.schema):
+                # Unify schemas by name; missing columns become nulls and
+                # compatible types widen (e.g. int64 + double -> double)
+                schema = pa.unify_schemas(
+                    [existing_schema, table.schema],
+                    promote_options='permissive'
+                ).remove_metadata()
+                existing_matches = existing_schema.equals(schema)
+        first_row_group = existing.num_row_groups if existing else 0
+
+        writer = pq.ParquetWriter(temp_file, schema, **self._writer_options(schema))
+        try:
+            if existing is not None:
+                for index in range(existing.num_row_groups):
+                    row_group = existing.read_row_group(index)
+                    if not existing_matches:
+                        row_group = self._conform_to_schema(row_group, schema)
+                    writer.write_table(row_group)
+            writer.write_table(
+                self._conform_to_schema(table, schema),
+                row_group_size=row_group_size
+            )
+        except Exception:
+            writer.close()
+            temp_file.unlink(missing_ok=True)
+            raise
+        finally:
+            if existing is not None:
+                existing.close()
+
+        return writer, temp_file, schema, first_row_group
+
+    def _open_writer(
+        self,
+        target_file: Path,
+        table: pa.Table,
+        session: IngestSession,
+        row_group_size: int = ROW_GROUP_SIZE
+    ) -> int:
+        """Start a session writer for target_file, returning the first new row group"""
+        writer, temp_file, schema, first_row_group = self._start_rewrite(
+            target_file, table, row_group_size
+        )
+        existing_rows = self._footer(target_file).num_rows if target_file.exists() else 0
+
+        # Held until _close_writer swaps the file in, so other processes
+        # cannot change the target under the open copy
+        self._process_lock.acquire()
+        self._open_writers[target_file] = {
+            "writer": writer,
+            "temp_file": temp_file,
+            "schema": schema,
+            "names": set(schema.names),
+            "rows": existing_rows + table.num_rows,
+            "row_groups": first_row_group + self._row_group_count(table.num_rows, row_group_size),
+            "session": session
+        }
+        session.files.add(target_file)
+        return first_row_group
+
+    def _write_to_open_writer(
+        self,
+        target_file: Path,
+        table: pa.Table,
+        row_group_size: int = ROW_GROUP_SIZE
+    ) -> Optional[int]:
+        """
+        Append to target_file's open writer if the table fits its schema
+
+        Returns the first new row group, or None if no writer was used
+        (none open, or the table brings new columns and the file was
+        finalized so a normal append can widen the schema).
+        """
+        open_writer = self._open_writers.get(target_file)
+        if open_writer is None:
+            return None
+
+        schema = open_writer["schema"]
+        if table.schema.equals(schema):
+            # Common case for a steady stream: write as-is
+            conformed = table
+        elif not set(table.column_names) <= open_writer["names"]:
+            self._close_writer(target_file)
+            return None
+        else:
+            try:
+                conformed = self._conform_to_schema(table, schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                # Type change the open file cannot hold
+                self._close_writer(target_file)
+                return None
+
+        open_writer["writer"].write_table(conformed, row_group_size=row_group_size)
+
+        first_row_group = open_writer["row_groups"]
+        open_writer["rows"] += table.num_rows
+        open_writer["row_groups"] += self._row_group_count(table.num_rows, row_group_size)
+        return first_row_group
+
+    def _row_group_count(self, num_rows: int, row_group_size: int) -> int:
+        return max(1, -(-num_rows // row_group_size))
+
+    def _close_writer(self, target_file: Path):
+        """Write the footer of an open file and swap it into place"""
+        open_writer = self._open_writers.pop(target_file)
+        open_writer["session"].files.discard(target_file)
+        try:
+            try:
+                open_writer["writer"].close()
+            except Exception:
+                open_writer["temp_file"].unlink(missing_ok=True)
+                raise
+            open_writer["temp_file"].replace(target_file)
+        finally:
+            self._process_lock.release()
+
+    def _close_session(self, session: IngestSession):
+        with self._write_lock:
+            for target_file in list(session.files):
+                with self._file_lock(target_file):
+                    self._close_writer(target_file)
+
+    def _index_record_ids(
+        self,
+        target_file: Path,
+        table: pa.Table,
+        first_row_group: int,
+        row_group_size: int = ROW_GROUP_SIZE
+    ):
+        """Point the id index at freshly written rows"""
+        if self.id_index is None or ID_FIELD not in table.column_names:
+            return
+        try:
+            self.id_index.add(
+                target_file, table[ID_FIELD].combine_chunks(), first_row_group, row_group_size
+            )
+        except Exception as e:
+            # Lookups fall back to scanning, so a stale index is not fatal
+            logger.warning(f"⚠️ Failed to index record IDs for {target_file.name}: {e}")
+
+    def _writer_options(self, schema: pa.Schema) -> Dict[str, Any]:
+        """Parquet writer settings shared by every write path"""
+        options = {
+            "compression": COMPRESSION,
+            "compression_level": COMPRESSION_LEVEL,
+            # Dictionary-encode everything but the unique record IDs
+            "use_dictionary": [name for name in schema.names if name != ID_FIELD],
+            "data_page_size": DATA_PAGE_SIZE,
+            "data_page_version": DATA_PAGE_VERSION,
+            "write_statistics": WRITE_STATISTICS
+        }
+
+        # String IDs share long prefixes ("user_0001", "user_0002", ...);
+        # prefix-delta encoding stores only each ID's new suffix
+        index = schema.get_field_index(ID_FIELD)
+        if index >= 0 and pa.types.is_string(schema.field(index).type):
+            options["column_encoding"] = {ID_FIELD: "DELTA_BYTE_ARRAY"}
+
+        return options
+
+    def _conform_to_schema(self, table: pa.Table, schema: pa.Schema) -> pa.Table:
+        """Reorder, cast and null-fill a table's columns to match schema"""
+        # One pass over the target schema with O(1) name lookups keeps
+        # wide tables linear in their column count
+        existing = dict(zip(table.column_names, table.columns))
+        columns = []
+        for field in schema:
+            column = existing.get(field.name)
+            if column is None:
+                column = pa.nulls(table.num_rows, type=field.type)
+            elif column.type != field.type:
+                column = column.cast(field.type)
+            columns.append(column)
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    def get_file_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get statistics for all Parquet files
+
+        Only the footer of each file is read (row count and schema come from
+        the Parquet metadata), and footers are cached until the file changes.
+        """
+        files = sorted(_scan_parquet_files(self.data_dir, recursive=True))
+        stats = [self._read_file_stats(file_path) for file_path in files]
+        return [file_stats for file_stats in stats if file_stats is not None]
+
+    def _read_file_stats(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Footer-only statistics for one Parquet file"""
+        try:
+            metadata = self._footer(file_path)
+            mtime_ns, size = self._footer_cache[file_path][:2]
+
+            return {
+                "filename": file_path.name,
+                "path": file_path.relative_to(self.data_dir).as_posix(),
+                "row_count": metadata.num_rows,
+                "file_size_mb": round(size / (1024 * 1024), 2),
+                "columns": metadata.schema.to_arrow_schema().names,
+                "modified": datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
+            }
+        except Exception as e:
+            logger.error(f"Error reading {file_path}: {e}")
+            return None
+
+    def _iter_jsonl_chunks(self, json_file_path: Path, chunk_size: int):
+        """
+        Yield JSONL bytes of up to chunk_size lines from a memory-mapped file
+
+        The map is cut into blocks of about JSON_BLOCK_SIZE ending at a
+        newline (found with rfind, i.e. memchr), and each block is split in
+        C with bytes.split, so lines are never decoded or parsed in Python.
+        """
+        with open(json_file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pending: List[bytes] = []
+                start = 0
+                while start < len(mm):
+                    end = min(start + JSON_BLOCK_SIZE, len(mm))
+                    if end < len(mm):
+                        newline = mm.rfind(b'\n', start, end)
+                        if newline < 0:
+                            # A line longer than a block: extend to its end
+                            newline = mm.find(b'\n', end)
+                        end = newline + 1 if newline >= 0 else len(mm)
+                    pending.extend(mm[start:end].split(b'\n'))
+                    start = end
+
+                    while len(pending) >= chunk_size:
+                        yield b'\n'.join(pending[:chunk_size])
+                        del pending[:chunk_size]
+
+                if any(line.strip() for line in pending):
+                    yield b'\n'.join(pending)
 
     def batch_ingest(
         self,
@@ -316,42 +1360,52 @@ class ParquetIngestionEngine:
         errors = 0
 
         try:
-            with open(json_file_path, 'r') as f:
-                # Try JSONL format first
-                batch = []
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        record = json.loads(line.strip())
-                        batch.append(record)
-
-                        if len(batch) >= chunk_size:
-                            result = self.append_to_parquet(batch)
-                            if result["status"] == "success":
-                                total_processed += result["records_processed"]
-                            else:
-                                errors += 1
-                            batch = []
-
-                    except json.JSONDecodeError:
-                        # Maybe it's a single JSON array
-                        f.seek(0)
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            result = self.append_to_parquet(data)
-                            return result
-                        break
-
-                # Process remaining batch
-                if batch:
-                    result = self.append_to_parquet(batch)
+            # One open writer per target file for the whole ingest
+            with self.session() as session:
+                # Fast path: vectorized JSONL parse, then append in chunks
+                try:
+                    table = self.read_jsonl_table(Path(json_file_path))
+                except pa.ArrowInvalid:
+                    # JSON array, or types pyarrow cannot reconcile
+                    table = None
+
+                if table is not None:
+                    for offset in range(0, table.num_rows, chunk_size):
+                        result = self.append_table(table.slice(offset, chunk_size), session=session)
+                        if result["status"] == "success":
+                            total_processed += result["records_processed"]
+                        else:
+                            errors += 1
+
+                    return {
+                        "status": "success",
+                        "total_records": total_processed,
+                        "errors": errors
+                    }
+
+                with open(json_file_path, 'rb') as f:
+                    is_array = f.read(4096).lstrip()[:1] == b'['
+
+                if is_array:
+                    # Single JSON array
+                    with open(json_file_path, 'rb') as f:
+                        return self.append_to_parquet(orjson.loads(f.read()), session=session)
+
+                # JSONL whose types conflict across the whole file: parse
+                # each chunk with the Arrow reader, which usually succeeds
+                # chunk by chunk (append_jsonl falls back to orjson if not)
+                for chunk in self._iter_jsonl_chunks(Path(json_file_path), chunk_size):
+                    result = self.append_jsonl(chunk, session=session)
                     if result["status"] == "success":
                         total_processed += result["records_processed"]
+                    else:
+                        errors += 1
 
-            return {
-                "status": "success",
-                "total_records": total_processed,
-                "errors": errors
-            }
+                return {
+                    "status": "success",
+                    "total_records": total_processed,
+                    "errors": errors
+                }
 
         except Exception as e:
             return {
@@ -360,5 +1414,183 @@ class ParquetIngestionEngine:
             }
 
 
-# Singleton instance
+class IngestBatcher:
+    """
+    Coalesces concurrent ingest requests into one Parquet write per partition
+
+    Requests are queued with a future; a background task drains the queue
+    every FLUSH_INTERVAL_MS (or once FLUSH_ROWS records are waiting), writes
+    each (data_date, data_type) group with one append_many call, and
+    resolves every future in the group.
+    """
+
+    def __init__(
+        self,
+        engine: ParquetIngestionEngine,
+        max_rows: int = FLUSH_ROWS,
+        max_wait: float = FLUSH_INTERVAL_MS / 1000
+    ):
+        self.engine = engine
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the flush loop on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run())
+        logger.info("🚚 Ingest batcher started")
+
+    async def stop(self):
+        """Flush everything still queued, then stop the loop"""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._queue = None
+        self._task = None
+
+    async def submit(
+        self,
+        records: List[Dict[str, Any]],
+        data_date: Optional[datetime] = None,
+        data_type: str = "default"
+    ) -> Dict[str, Any]:
+        """Queue records for the next combined write and wait for its result"""
+        return await (await self.enqueue(records, data_date, data_type))
+
+    async def enqueue(
+        self,
+        records: List[Dict[str, Any]],
+        data_date: Optional[datetime] = None,
+        data_type: str = "default"
+    ) -> asyncio.Future:
+        """
+        Queue records and return a future for their write result
+
+        Returns as soon as the records are queued, so callers can
+        acknowledge a request before it reaches disk. Waits only when the
+        queue is full (backpressure).
+        """
+        if self._task is None or not records:
+            # Not running (scripts, tests) or nothing to coalesce
+            return asyncio.ensure_future(asyncio.to_thread(
+                self.engine.append_to_parquet, records, data_date, data_type
+            ))
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, data_date, data_type, future))
+        return future
+
+    async def _run(self):
+        while True:
+            pending, stopping = await self._drain()
+
+            # One write per partition; different dates/types go to different files
+            groups: Dict[tuple, list] = {}
+            for item in pending:
+                groups.setdefault((item[1], item[2]), []).append(item)
+
+            # Partitions write to different files, so flush them in parallel
+            await asyncio.gather(*(
+                self._flush(items, data_date, data_type)
+                for (data_date, data_type), items in groups.items()
+            ))
+
+            if stopping:
+                return
+
+    async def _drain(self) -> tuple:
+        """Wait for one request, then collect more until the row or time limit"""
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+
+        pending = [first]
+        rows = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+
+        while rows < self.max_rows:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                return pending, True
+            pending.append(item)
+            rows += len(item[0])
+
+        return pending, False
+
+    async def _flush(self, items: List[tuple], data_date: Optional[datetime], data_type: str):
+        """Write a group's requests together, resolving each request's future"""
+        if len(items) == 1:
+            results = [await asyncio.to_thread(
+                self.engine.append_to_parquet, items[0][0], data_date, data_type
+            )]
+        else:
+            results = await asyncio.to_thread(self._write_group, items, data_date, data_type)
+
+        for item, result in zip(items, results):
+            future = item[3]
+            if not future.done():
+                future.set_result({**result, "batched_requests": len(items)})
+
+    def _write_group(
+        self,
+        items: List[tuple],
+        data_date: Optional[datetime],
+        data_type: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Normalize each request on its own, then write them with append_many
+
+        A column's type is settled per request, so it never depends on which
+        requests shared a flush. Requests whose types cannot be unified are
+        written one at a time instead.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        tables = []
+        for index, item in enumerate(items):
+            try:
+                tables.append((index, self.engine._records_table(item[0])))
+            except Exception as e:
+                logger.error(f"❌ Ingestion failed: {str(e)}")
+                results[index] = {"status": "error", "message": str(e), "records_processed": 0}
+
+        try:
+            pa.unify_schemas([table.schema for _, table in tables], promote_options='permissive')
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            written = [None] * len(tables)
+        else:
+            try:
+                written = self.engine.append_many(
+                    [(table, data_date, data_type) for _, table in tables]
+                )
+            except Exception as e:
+                # Finalizing the files failed; some may already be in place
+                logger.error(f"❌ Ingestion failed: {str(e)}")
+                error = {"status": "error", "message": str(e), "records_processed": 0}
+                for index, _ in tables:
+                    results[index] = error
+                return results
+
+        for (index, _), result in zip(tables, written):
+            if result is None or (
+                result["status"] == "error" and result["records_processed"] == 0
+            ):
+                # Conflicting types, or a failed write that stored nothing:
+                # retry alone so one bad request doesn't fail the others
+                result = self.engine.append_to_parquet(items[index][0], data_date, data_type)
+            results[index] = result
+
+        return results
+
+
+# Singleton instances
 ingestion_engine = ParquetIngestionEngine()
+ingest_batcher = IngestBatcher(ingestion_engine)
@@ -2,50 +2,515 @@
 DuckDB query engine for efficient Parquet querying
 Supports SQL and high-level query interfaces
 """
+import asyncio
 import duckdb
+import numpy as np
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import logging
+import threading
+import time
 from config import (
-    DATA_DIR, DUCKDB_FILE, DUCKDB_MEMORY_LIMIT,
-    DUCKDB_THREADS, MAX_QUERY_RESULTS, DEFAULT_LIMIT,
-    DATE_FIELD, ID_FIELD, TYPE_FIELD
+    DATA_DIR, MAX_QUERY_RESULTS, DEFAULT_LIMIT,
+    DATE_FIELD, ID_FIELD, TYPE_FIELD,
+    SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL, FTS_ENABLED, FTS_REBUILD_DELAY
 )
+from db_pool import DuckDBPool, db_pool
+from id_index import RecordIdIndex, id_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# year/month/type_fromDay_toDay.parquet relative to the data directory
+_PARTITION_PATH_RE = re.compile(
+    r'(\d+)[\\/](\d+)[\\/]([^_\\/]*)_(\d+)_(\d+)\.parquet\Z', re.ASCII
+)
+
+# search_corpus column naming the file each row was copied from
+_CORPUS_SOURCE = "__source_file"
+
+
+def _pack_date(year: int, month: int, day: int) -> int:
+    """(year, month, day) as one sortable integer: year<<16 | month<<8 | day"""
+    return (year << 16) | (month << 8) | day
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a column name for SQL (handles dots, spaces and quotes)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _select_list(columns: Optional[List[str]] = None, alias: str = "") -> str:
+    """SELECT list for the requested columns ("*" when unset)"""
+    prefix = f"{alias}." if alias else ""
+    if not columns:
+        return prefix + "*"
+    return ", ".join(prefix + _quote_identifier(column) for column in columns)
+
+
+def _fetch_rows(result) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Result rows as dicts plus column names, converted from Arrow without pandas"""
+    table = result.fetch_arrow_table()
+    return table.to_pylist(), table.column_names
+
+
+class SearchCache:
+    """LRU cache of search results with a TTL, evicted per data type on ingest"""
+
+    def __init__(self, maxsize: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (stored_at, result, data types present in the result)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached result and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Tuple, result: Dict[str, Any]):
+        # None: the result doesn't include data types, so any ingest may change it
+        data_types = None
+        if TYPE_FIELD in result.get("columns", ()):
+            data_types = {row.get(TYPE_FIELD) for row in result["data"]}
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result, data_types)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, data_type: Optional[str] = None):
+        """
+        Drop results that newly ingested data of `data_type` could change
+
+        Results that already hit their limit and hold no rows of that type
+        remain valid answers, so only those are kept.
+        """
+        with self._lock:
+            if data_type is None:
+                self._entries.clear()
+                return
+
+            for key, (_, result, data_types) in list(self._entries.items()):
+                if data_types is None or data_type in data_types or result["row_count"] < key[2]:
+                    del self._entries[key]
+
+
 class DuckDBQueryEngine:
     """High-performance query engine for Parquet data"""
 
-    def __init__(self, db_file: Path = DUCKDB_FILE, data_dir: Path = DATA_DIR):
-        self.db_file = Path(db_file)
+    def __init__(
+        self,
+        pool: DuckDBPool = db_pool,
+        data_dir: Path = DATA_DIR,
+        index: RecordIdIndex = id_index
+    ):
+        self.pool = pool
+        self.id_index = index
+        self.database = pool.database
         self.data_dir = Path(data_dir)
-        self.connection = None
+        self.connection = pool.connection
+        self.search_cache = SearchCache()
+
+        # Directory listings keyed by path, reused while the directory's
+        # mtime is unchanged (adding, removing or renaming a file bumps it)
+        self._dir_cache: Dict[Path, Tuple[int, List[Path], List[Path]]] = {}
+        # Bumped whenever a directory is (re)listed; the file index below is
+        # rebuilt only when it changes
+        self._scan_generation = 0
+        # Guards the directory cache and the structures derived from it;
+        # request threads and data_version() walk the tree concurrently
+        self._scan_lock = threading.RLock()
+        # (generation, index) with each file's packed (year, month, day)
+        # range, so range/type pruning is one vectorized mask
+        self._file_index: Optional[Tuple[int, np.ndarray]] = None
+        # (generation, sorted files); an unchanged tree costs one stat per
+        # directory per query and the same tuple comes back, so comparing
+        # it with _view_files is an identity check
+        self._sorted_files: Optional[Tuple[int, Tuple[Path, ...]]] = None
+        # File list the all_records view was last created over
+        self._view_files: Optional[Tuple[Path, ...]] = None
+        # (view files, DESCRIBE rows) of all_records; dropped on ingest too,
+        # since rewritten files can add columns without changing the list
+        self._schema_cache: Optional[Tuple[Tuple[Path, ...], List[Dict[str, Any]]]] = None
+
+        # Full-text index state: rebuilt off the request path after ingests,
+        # and only used while it covers every ingest so far
+        self.fts_available = False
+        self._fts_connection = None
+        # Runs full-text and id index refreshes off the request path
+        self._index_executor = ThreadPoolExecutor(max_workers=1)
+        self._fts_lock = threading.Lock()
+        self._fts_generation = 0
+        self._fts_scheduled = False
+        self._fts_built_generation = -1
+        self._fts_columns: set = set()
+
+        # Other processes (API workers, CLI imports) write the same files
+        # without calling notify_ingest. data_version() compares the
+        # directory scan generation with the one last seen to detect them.
+        self._seen_generation = -1
+        self._data_version = 0
+        self._version_lock = threading.Lock()
+        # (size, mtime) of each file as of the last id index refresh
+        self._indexed_files: Dict[Path, Tuple[int, int]] = {}
+
         self._connect()
 
     def _connect(self):
-        """Establish DuckDB connection with optimization"""
+        """Register Parquet data on the pooled base connection"""
         try:
-            self.connection = duckdb.connect(str(self.db_file))
-
-            # Performance tuning
-            self.connection.execute(f"SET memory_limit='{DUCKDB_MEMORY_LIMIT}'")
-            self.connection.execute(f"SET threads TO {DUCKDB_THREADS}")
-            self.connection.execute("SET enable_progress_bar=true")
-
             # Register all Parquet files as a view
             self._register_parquet_view()
 
-            logger.info(f"✅ DuckDB connected: {self.db_file}")
+            # Files written before the id index existed
+            if self.id_index.is_empty():
+                self.id_index.rebuild(self._get_parquet_files_for_range())
+            self._indexed_files = self._file_stats(self._all_files_sorted())
+            self._seen_generation = self._scan_generation
+
+            self.fts_available = self._load_fts()
+            self.schedule_fts_rebuild()
 
         except Exception as e:
-            logger.error(f"❌ DuckDB connection failed: {e}")
+            logger.error(f"❌ DuckDB view registration failed: {e}")
             raise
 
+    def _load_fts(self) -> bool:
+        """Load DuckDB's full-text search extension if it is available"""
+        if not FTS_ENABLED:
+            return False
+        try:
+            self.connection.execute("INSTALL fts")
+            self.connection.execute("LOAD fts")
+            # Dedicated connection so index builds never hold the view lock
+            self._fts_connection = self.connection.cursor()
+            logger.info("🔎 FTS extension loaded")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ FTS extension unavailable, search scans columns: {e}")
+            return False
+
+    def notify_ingest(self, data_type: Optional[str] = None):
+        """Drop stale search results and refresh the full-text index"""
+        # This ingest's own file changes need no data_version() refresh
+        self._all_files_sorted()
+        with self._version_lock:
+            self._seen_generation = self._scan_generation
+        self.search_cache.invalidate(data_type)
+        self._schema_cache = None
+        self.schedule_fts_rebuild()
+
+    def data_version(self) -> int:
+        """
+        Counter bumped when the Parquet files change outside notify_ingest
+
+        Costs one stat per directory. On a change, cached search results and
+        schema are dropped, and the full-text and id indexes are refreshed in
+        the background, so writes by other API workers are picked up too.
+        """
+        self._all_files_sorted()
+        with self._version_lock:
+            if self._scan_generation == self._seen_generation:
+                return self._data_version
+            self._seen_generation = self._scan_generation
+            self._data_version += 1
+            version = self._data_version
+
+        logger.info("🔄 Parquet files changed in another process, refreshing caches")
+        self.search_cache.invalidate()
+        self._schema_cache = None
+        self.schedule_fts_rebuild()
+        self._index_executor.submit(self._reindex_changed_files)
+        return version
+
+    def _file_stats(self, files: Tuple[Path, ...]) -> Dict[Path, Tuple[int, int]]:
+        """(size, mtime) of each file, skipping files removed meanwhile"""
+        stats = {}
+        for parquet_file in files:
+            try:
+                stat = parquet_file.stat()
+            except FileNotFoundError:
+                continue
+            stats[parquet_file] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def _reindex_changed_files(self):
+        """Add IDs from files written or rewritten since the last refresh"""
+        try:
+            current = self._file_stats(self._all_files_sorted())
+            changed = [
+                parquet_file for parquet_file, stat in current.items()
+                if self._indexed_files.get(parquet_file) != stat
+            ]
+            if changed:
+                self.id_index.rebuild(changed)
+            self._indexed_files = current
+        except Exception as e:
+            logger.warning(f"⚠️ Id index refresh failed: {e}")
+
+    def schedule_fts_rebuild(self):
+        """
+        Queue a background refresh of the full-text index
+
+        Calls made while a refresh is already queued only bump the
+        generation, so a burst of ingests coalesces into one refresh.
+        """
+        if not self.fts_available:
+            return
+        with self._fts_lock:
+            self._fts_generation += 1
+            if self._fts_scheduled:
+                return
+            self._fts_scheduled = True
+        self._index_executor.submit(self._rebuild_fts_index)
+
+    def _fts_ready(self) -> bool:
+        return self.fts_available and self._fts_built_generation == self._fts_generation
+
+    def _rebuild_fts_index(self):
+        """
+        Bring the BM25 index up to date with the Parquet files
+
+        The fts extension indexes tables only, so record IDs and text
+        columns are copied into `search_corpus` and indexed there. Only
+        rows of new or rewritten files are copied (see _sync_search_corpus),
+        and a restart over unchanged files reuses the persisted index.
+        """
+        # Let the rest of an ingest burst land before reading the files
+        time.sleep(FTS_REBUILD_DELAY)
+        with self._fts_lock:
+            self._fts_scheduled = False
+            generation = self._fts_generation
+        if self._fts_built_generation == generation:
+            return
+
+        try:
+            self._register_parquet_view()
+            connection = self._fts_connection
+
+            text_columns = [
+                col for col in self._text_columns(connection) if col != ID_FIELD
+            ]
+            if not text_columns:
+                return
+
+            changed = self._sync_search_corpus(connection, self._view_files or (), text_columns)
+            corpus_columns = self._corpus_columns(connection)
+
+            if changed or not self._fts_index_exists(connection):
+                column_args = ", ".join(
+                    "'" + col.replace("'", "''") + "'" for col in corpus_columns
+                )
+                connection.execute(
+                    f"PRAGMA create_fts_index('search_corpus', '{ID_FIELD}', {column_args}, overwrite=1)"
+                )
+                self.search_cache.invalidate()
+                logger.info(f"🔎 Rebuilt full-text index over {len(corpus_columns)} column(s)")
+            else:
+                logger.info("🔎 Full-text index is current, reusing it")
+
+            self._fts_columns = set(corpus_columns)
+            self._fts_built_generation = generation
+
+        except Exception as e:
+            logger.warning(f"⚠️ Full-text index rebuild failed: {e}")
+
+    def _sync_search_corpus(
+        self,
+        connection,
+        files: Tuple[Path, ...],
+        text_columns: List[str]
+    ) -> bool:
+        """
+        Copy rows of new or rewritten files into search_corpus
+
+        `search_corpus_files` remembers the size and mtime of every file
+        already copied. Rows of removed or rewritten files are deleted, and
+        only the rewritten and new files are read. Returns True if the
+        corpus changed.
+
+        Args:
+            connection: Connection the corpus tables live on
+            files: Parquet files the corpus should cover
+            text_columns: Text columns of all_records (without the ID)
+        """
+        changed = False
+        corpus_columns = self._corpus_columns(connection)
+        if corpus_columns is None or not set(corpus_columns) <= set(text_columns):
+            # First build, or a column is no longer text: start over
+            column_defs = "".join(f", {_quote_identifier(col)} VARCHAR" for col in text_columns)
+            connection.execute(f"""
+                CREATE OR REPLACE TABLE search_corpus (
+                    {ID_FIELD} VARCHAR, {_CORPUS_SOURCE} VARCHAR{column_defs}
+                )
+            """)
+            connection.execute("""
+                CREATE OR REPLACE TABLE search_corpus_files (
+                    file_path VARCHAR PRIMARY KEY, size BIGINT, mtime_ns BIGINT
+                )
+            """)
+            corpus_columns = list(text_columns)
+            changed = True
+
+        for col in text_columns:
+            if col not in corpus_columns:
+                # Older rows lack the column, which NULL already says
+                connection.execute(
+                    f"ALTER TABLE search_corpus ADD COLUMN {_quote_identifier(col)} VARCHAR"
+                )
+                changed = True
+
+        current = {}
+        for parquet_file in files:
+            stat = parquet_file.stat()
+            current[str(parquet_file).replace('\\', '/')] = (
+                parquet_file, stat.st_size, stat.st_mtime_ns
+            )
+        known = {
+            path: (size, mtime_ns) for path, size, mtime_ns in
+            connection.execute("SELECT file_path, size, mtime_ns FROM search_corpus_files").fetchall()
+        }
+        stale = [path for path in known if current.get(path, (None,))[1:] != known[path]]
+        fresh = [path for path, entry in current.items() if known.get(path) != entry[1:]]
+
+        if stale:
+            connection.execute(
+                f"DELETE FROM search_corpus WHERE list_contains(?, {_CORPUS_SOURCE})", [stale]
+            )
+            connection.execute(
+                "DELETE FROM search_corpus_files WHERE list_contains(?, file_path)", [stale]
+            )
+            changed = True
+
+        if fresh:
+            source = self._read_parquet_expr([current[path][0] for path in fresh])
+            source = source[:-1] + f", filename='{_CORPUS_SOURCE}')"
+            available = {
+                row[0] for row in connection.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+            }
+            if ID_FIELD in available:
+                select_list = ", ".join(
+                    f"CAST({_quote_identifier(col)} AS VARCHAR) AS {_quote_identifier(col)}"
+                    for col in text_columns if col in available
+                )
+                # A re-ingested ID keeps only its newest copy
+                connection.execute(f"""
+                    DELETE FROM search_corpus WHERE {ID_FIELD} IN (
+                        SELECT CAST({ID_FIELD} AS VARCHAR) FROM {source}
+                    )
+                """)
+                connection.execute(f"""
+                    INSERT INTO search_corpus BY NAME
+                    SELECT DISTINCT ON ({ID_FIELD})
+                        CAST({ID_FIELD} AS VARCHAR) AS {ID_FIELD},
+                        {_CORPUS_SOURCE}{", " + select_list if select_list else ""}
+                    FROM {source}
+                    WHERE {ID_FIELD} IS NOT NULL
+                """)
+            connection.executemany(
+                "INSERT INTO search_corpus_files VALUES (?, ?, ?)",
+                [[path, *current[path][1:]] for path in fresh]
+            )
+            changed = True
+
+        return changed
+
+    def _corpus_columns(self, connection) -> Optional[List[str]]:
+        """Text columns held in search_corpus, None if it doesn't exist yet"""
+        try:
+            rows = connection.execute("DESCRIBE search_corpus").fetchall()
+        except duckdb.CatalogException:
+            return None
+        return [row[0] for row in rows if row[0] not in (ID_FIELD, _CORPUS_SOURCE)]
+
+    def _fts_index_exists(self, connection) -> bool:
+        """True if a BM25 index over search_corpus has been created"""
+        return connection.execute(
+            "SELECT count(*) FROM duckdb_tables() WHERE schema_name = 'fts_main_search_corpus'"
+        ).fetchone()[0] > 0
+
+    def _describe(self, connection) -> List[Dict[str, Any]]:
+        """DESCRIBE all_records, cached until the view's files or schema change"""
+        files = self._view_files
+        cached = self._schema_cache
+        if cached and cached[0] == files:
+            return cached[1]
+        rows = _fetch_rows(connection.execute("DESCRIBE all_records"))[0]
+        self._schema_cache = (files, rows)
+        return rows
+
+    def _text_columns(self, connection) -> List[str]:
+        """Names of text-like columns in all_records"""
+        return [
+            row['column_name'] for row in self._describe(connection)
+            if any(t in str(row['column_type']).upper() for t in ['VARCHAR', 'TEXT', 'STRING', 'CHAR'])
+        ]
+
+    def _cursor(self, cursor=None):
+        """Resolve the connection a query should run on"""
+        return cursor if cursor is not None else self.connection
+
+    def _scan_dir(self, directory: Path) -> Tuple[List[Path], List[Path]]:
+        """(subdirectories, Parquet files) of a directory, cached by its mtime"""
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._dir_cache.pop(directory, None)
+            return [], []
+
+        cached = self._dir_cache.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+        self._scan_generation += 1
+
+        subdirs, files = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(Path(entry.path))
+                elif entry.name.endswith('.parquet'):
+                    files.append(Path(entry.path))
+
+        self._dir_cache[directory] = (mtime, subdirs, files)
+        return subdirs, files
+
+    def _all_parquet_files(self, directory: Path) -> List[Path]:
+        """Every Parquet file below a directory, one stat per unchanged directory"""
+        subdirs, files = self._scan_dir(directory)
+        files = list(files)
+        for subdir in subdirs:
+            files.extend(self._all_parquet_files(subdir))
+        return files
+
+    def _all_files_sorted(self) -> Tuple[Path, ...]:
+        """Every Parquet file below data_dir in path order, re-sorted only on change"""
+        with self._scan_lock:
+            files = self._all_parquet_files(self.data_dir)
+            cached = self._sorted_files
+            if cached and cached[0] == self._scan_generation:
+                return cached[1]
+            files = tuple(sorted(files))
+            self._sorted_files = (self._scan_generation, files)
+            return files
+
     def _get_parquet_files_for_range(
         self,
         start_date: Optional[datetime] = None,
@@ -56,103 +521,160 @@ class DuckDBQueryEngine:
         Find relevant Parquet files based on date range and type
         Uses directory structure: year/month/type_fromDay_toDay.parquet
         """
-        files = []
-
         # If no filters, get all parquet files recursively
         if not start_date and not end_date and not data_type:
-            files = list(self.data_dir.rglob("*.parquet"))
-            return files
+            return list(self._all_files_sorted())
 
-        # Walk through the directory structure
-        for year_dir in self.data_dir.iterdir():
-            if not year_dir.is_dir():
-                continue
+        index = self._get_file_index()
+        mask = np.ones(len(index), dtype=bool)
+        if start_date:
+            mask &= index['to'] >= _pack_date(start_date.year, start_date.month, start_date.day)
+        if end_date:
+            mask &= index['from'] <= _pack_date(end_date.year, end_date.month, end_date.day)
+        if data_type:
+            mask &= index['type'] == data_type.lower()
+        # Files outside the year/month layout never match a filtered query
+        mask &= index['from'] <= index['to']
 
-            try:
-                year = int(year_dir.name)
-            except ValueError:
-                continue
-
-            # Check if year is in range
-            if start_date and year < start_date.year:
-                continue
-            if end_date and year > end_date.year:
-                continue
+        return index['path'][mask].tolist()
 
-            for month_dir in year_dir.iterdir():
-                if not month_dir.is_dir():
-                    continue
+    def _get_file_index(self) -> np.ndarray:
+        """Packed day ranges, types and paths of every file, sorted by path"""
+        with self._scan_lock:
+            files = self._all_files_sorted()
+            cached = self._file_index
+            if cached and cached[0] == self._scan_generation:
+                return cached[1]
 
-                try:
-                    month = int(month_dir.name)
-                except ValueError:
-                    continue
+            index = np.empty(len(files), dtype=[
+                ('from', 'u4'), ('to', 'u4'), ('type', 'O'), ('path', 'O')
+            ])
+            prefix_length = len(os.path.join(str(self.data_dir), ''))
+            entries = [
+                self._parse_partition_path(parquet_file, str(parquet_file)[prefix_length:])
+                for parquet_file in files
+            ]
+            for i, entry in enumerate(entries):
+                index[i] = entry
 
-                # Check if month is in range
-                if start_date and (year == start_date.year and month < start_date.month):
-                    continue
-                if end_date and (year == end_date.year and month > end_date.month):
-                    continue
+            self._file_index = (self._scan_generation, index)
+            return index
 
-                # Get parquet files in this month
-                for parquet_file in month_dir.glob("*.parquet"):
-                    # Filter by type if specified
-                    if data_type:
-                        # Filename format: type_fromDay_toDay.parquet
-                        file_type = parquet_file.stem.split('_')[0]
-                        if file_type != data_type.lower():
-                            continue
+    def _parse_partition_path(self, parquet_file: Path, relative: str) -> tuple:
+        """(from key, to key, type, path) for the file index"""
+        # Files the ingestion engine writes: year/month/type_fromDay_toDay.parquet
+        match = _PARTITION_PATH_RE.match(relative)
+        if match:
+            year, month, file_type, from_day, to_day = match.groups()
+            year, month = int(year), int(month)
+            return (
+                _pack_date(year, month, int(from_day)),
+                _pack_date(year, month, int(to_day)),
+                file_type,
+                parquet_file
+            )
 
-                    files.append(parquet_file)
+        # Anything else: type is the first _ token; from > to never matches
+        from_key, to_key = 1, 0
+        try:
+            if parquet_file.parent.parent.parent != self.data_dir:
+                raise ValueError(parquet_file)
+            year = int(parquet_file.parent.parent.name)
+            month = int(parquet_file.parent.name)
+            from_day, to_day = self._file_day_range(parquet_file) or (1, 31)
+            from_key = _pack_date(year, month, from_day)
+            to_key = _pack_date(year, month, to_day)
+        except ValueError:
+            pass
+        return from_key, to_key, parquet_file.stem.split('_')[0], parquet_file
 
-        return files
+    def _file_day_range(self, parquet_file: Path) -> Optional[Tuple[int, int]]:
+        """(fromDay, toDay) from a type_fromDay_toDay.parquet name, None if not one"""
+        parts = parquet_file.stem.rsplit('_', 2)
+        if len(parts) != 3:
+            return None
+        try:
+            return int(parts[1]), int(parts[2])
+        except ValueError:
+            return None
 
-    def _register_parquet_view(
-        self,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        data_type: Optional[str] = None
-    ):
+    def _register_parquet_view(self):
         """
-        Create view pointing to relevant Parquet files
-        Intelligently filters based on date range and type
+        Create the all_records view over every Parquet file
+
+        The view is shared by all queries, so it always covers the full file
+        set; filtered queries read a pruned list via _parquet_source instead.
+        It is only recreated when the file list changed since the last
+        registration; DuckDB re-binds it, and so picks up new columns in
+        rewritten files, on every query.
         """
-        # Get relevant files
-        files = self._get_parquet_files_for_range(start_date, end_date, data_type)
+        files = self._all_files_sorted()
 
         if not files:
-            logger.warning("⚠️ No Parquet files found for specified criteria")
+            logger.warning("⚠️ No Parquet files found")
             return
 
-        # Create pattern for DuckDB
-        if len(files) == 1:
-            parquet_pattern = str(files[0]).replace('\\', '/')
-        else:
-            # Use list of files for efficiency
-            file_list = [str(f).replace('\\', '/') for f in files]
-            parquet_pattern = "['" + "','".join(file_list) + "']"
+        # Unchanged file list: nothing to do, not even taking the lock
+        if files is self._view_files:
+            return
 
-        try:
-            self.connection.execute(f"""
-                CREATE OR REPLACE VIEW all_records AS
-                SELECT * FROM read_parquet({parquet_pattern})
-            """)
+        # Catalog changes go through the base connection, one writer at a time
+        with self.pool.write_lock:
+            if files == self._view_files:
+                return
+            try:
+                self.connection.execute(f"""
+                    CREATE OR REPLACE VIEW all_records AS
+                    SELECT * FROM {self._read_parquet_expr(files)}
+                """)
+                self._view_files = files
 
-            logger.info(f"📊 Registered {len(files)} Parquet file(s)")
-        except Exception as e:
-            logger.error(f"Failed to register view: {e}")
-            # Fallback to recursive glob
-            parquet_pattern = str(self.data_dir / "**" / "*.parquet").replace('\\', '/')
-            self.connection.execute(f"""
-                CREATE OR REPLACE VIEW all_records AS
-                SELECT * FROM read_parquet('{parquet_pattern}')
-            """)
-            logger.info(f"📊 Registered Parquet view (recursive): {parquet_pattern}")
+                logger.info(f"📊 Registered {len(files)} Parquet file(s)")
+            except Exception as e:
+                self._view_files = None
+                logger.error(f"Failed to register view: {e}")
+                # Fallback to recursive glob
+                parquet_pattern = str(self.data_dir / "**" / "*.parquet").replace('\\', '/')
+                self.connection.execute(f"""
+                    CREATE OR REPLACE VIEW all_records AS
+                    SELECT * FROM read_parquet('{parquet_pattern}', union_by_name=true)
+                """)
+                logger.info(f"📊 Registered Parquet view (recursive): {parquet_pattern}")
+
+    def _read_parquet_expr(self, files: List[Path]) -> str:
+        """Build a read_parquet() call over an explicit file list"""
+        # Files written at different times may differ in columns
+        file_list = ", ".join(
+            "'" + str(f).replace('\\', '/').replace("'", "''") + "'"
+            for f in files
+        )
+        return f"read_parquet([{file_list}], union_by_name=true)"
+
+    def _parquet_source(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        data_type: Optional[str] = None
+    ) -> str:
+        """
+        FROM-clause source reading only files that can match the filters
+        Files outside the date range are pruned before DuckDB opens them
+        """
+        files = tuple(self._get_parquet_files_for_range(start_date, end_date, data_type))
+        if not files:
+            # Nothing to prune against - the view yields the right (empty) answer
+            return "all_records"
+        if files == self._view_files:
+            # Nothing was pruned: reuse the view rather than inlining every path
+            return "all_records"
+        return self._read_parquet_expr(files)
 
     def execute_sql(
         self,
         query: str,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        cursor=None,
+        params: Optional[List[Any]] = None
     ) -> Dict[str, Any]:
         """
         Execute raw SQL query
@@ -160,6 +682,8 @@ class DuckDBQueryEngine:
         Args:
             query: SQL query string
             limit: Optional result limit
+            cursor: Pooled cursor to run on (defaults to the base connection)
+            params: Values bound to the query's ? placeholders
 
         Returns:
             Query results with metadata
@@ -168,21 +692,21 @@ class DuckDBQueryEngine:
             # Refresh view to handle schema changes
             self._register_parquet_view()
 
-            start_time = datetime.now()
+            start_time = time.perf_counter()
 
             # Add safety limit if not present
             if limit and "LIMIT" not in query.upper():
                 query = f"{query.rstrip(';')} LIMIT {limit}"
 
-            result = self.connection.execute(query).fetchdf()
+            rows, columns = _fetch_rows(self._cursor(cursor).execute(query, params))
 
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
 
             return {
                 "status": "success",
-                "data": result.to_dict(orient='records'),
-                "row_count": len(result),
-                "columns": list(result.columns),
+                "data": rows,
+                "row_count": len(rows),
+                "columns": columns,
                 "duration_seconds": round(duration, 3),
                 "query": query
             }
@@ -195,20 +719,175 @@ class DuckDBQueryEngine:
                 "query": query
             }
 
-    def query_by_id(self, record_id: str) -> Dict[str, Any]:
-        """Query single record by ID"""
+    def execute_batch(
+        self,
+        queries: List[str],
+        cursor=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several independent queries on one cursor
+
+        The view is refreshed once for the whole batch rather than per query.
+
+        Args:
+            queries: SQL query strings, run in order
+            cursor: Pooled cursor to run on (defaults to the base connection)
+
+        Returns:
+            One execute_sql-style result per query
+        """
+        self._register_parquet_view()
+        connection = self._cursor(cursor)
+        results = []
+        for query in queries:
+            try:
+                start_time = time.perf_counter()
+                rows, columns = _fetch_rows(connection.execute(query))
+                results.append({
+                    "status": "success",
+                    "data": rows,
+                    "row_count": len(rows),
+                    "columns": columns,
+                    "duration_seconds": round(time.perf_counter() - start_time, 3),
+                    "query": query
+                })
+            except Exception as e:
+                logger.error(f"❌ Query failed: {e}")
+                results.append({"status": "error", "message": str(e), "query": query})
+        return results
+
+    async def aexecute_sql(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        params: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        execute_sql for async callers: runs on a pooled cursor in a worker
+        thread, so concurrent queries overlap instead of blocking the loop
+        """
+        async with self.pool.acquire() as cursor:
+            return await asyncio.to_thread(self.execute_sql, query, limit, cursor, params)
+
+    def execute_user_sql(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        cursor=None
+    ) -> Dict[str, Any]:
+        """
+        Execute client-supplied SQL with read-only and row-count guards
+
+        Only a single SELECT-type statement is accepted (DDL, DML, COPY,
+        ATTACH and multi-statement batches are rejected before execution),
+        and the query is wrapped so its result never exceeds the limit.
+
+        Args:
+            query: SQL query string from the client
+            limit: Optional result limit (capped at MAX_QUERY_RESULTS)
+            cursor: Pooled cursor to run on (defaults to the base connection)
+        """
+        try:
+            statements = duckdb.extract_statements(query)
+        except duckdb.Error as e:
+            return {"status": "error", "message": str(e), "query": query}
+
+        if len(statements) != 1:
+            return {
+                "status": "error",
+                "message": "Exactly one SQL statement is allowed per request",
+                "query": query
+            }
+
+        statement = statements[0]
+        if statement.type != duckdb.StatementType.SELECT:
+            return {
+                "status": "error",
+                "message": f"Only read-only SELECT queries are allowed (got {statement.type.name})",
+                "query": query
+            }
+
+        row_limit = min(limit or MAX_QUERY_RESULTS, MAX_QUERY_RESULTS)
+        inner = statement.query.strip().rstrip(';')
+        # Newlines around the inner query keep a trailing -- comment from
+        # swallowing the closing parenthesis
+        return self.execute_sql(
+            f"SELECT * FROM (\n{inner}\n) LIMIT {row_limit}",
+            cursor=cursor
+        )
+
+    def query_by_id(self, record_id: str, cursor=None) -> Dict[str, Any]:
+        """
+        Query single record by ID
+        Seeks the id index and reads one row group; scans all records on a miss
+        """
+        connection = self._cursor(cursor)
+        # Queues an id index refresh if another process wrote
+        self.data_version()
+
+        try:
+            location = self.id_index.lookup(record_id, connection)
+            if location:
+                result = self._read_indexed_record(record_id, *location)
+                if result:
+                    return result
+        except Exception as e:
+            logger.warning(f"⚠️ Id index lookup failed, scanning instead: {e}")
+
         query = f"""
             SELECT * FROM all_records
-            WHERE {ID_FIELD} = '{record_id}'
+            WHERE CAST({ID_FIELD} AS VARCHAR) = ?
             LIMIT 1
         """
-        return self.execute_sql(query)
+        return self.execute_sql(query, cursor=cursor, params=[str(record_id)])
+
+    def _read_indexed_record(
+        self,
+        record_id: str,
+        file_path: Path,
+        row_group: int
+    ) -> Optional[Dict[str, Any]]:
+        """Read a record from the row group the index points at, None if stale"""
+        # The index is shared process-wide; only trust entries under our data_dir
+        if not file_path.resolve().is_relative_to(self.data_dir.resolve()):
+            return None
+        if not file_path.exists():
+            return None
+
+        start_time = time.perf_counter()
+
+        with pq.ParquetFile(file_path) as parquet_file:
+            if row_group >= parquet_file.num_row_groups:
+                return None
+            table = parquet_file.read_row_group(row_group)
+
+        if ID_FIELD not in table.column_names:
+            return None
+        matches = table.filter(pc.equal(pc.cast(table[ID_FIELD], pa.string()), str(record_id)))
+        if matches.num_rows == 0:
+            return None
+
+        rows = matches.slice(0, 1).to_pylist()
+        columns = matches.column_names
+
+        duration = time.perf_counter() - start_time
+
+        return {
+            "status": "success",
+            "data": rows,
+            "row_count": len(rows),
+            "columns": columns,
+            "duration_seconds": round(duration, 3),
+            "query": f"id index: {file_path.name} row group {row_group}"
+        }
 
     def query_by_date_range(
         self,
         start_date: str,
         end_date: str,
-        limit: int = DEFAULT_LIMIT
+        limit: int = DEFAULT_LIMIT,
+        cursor=None,
+        columns: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Query records within date range
@@ -217,42 +896,131 @@ class DuckDBQueryEngine:
             start_date: ISO format date (e.g., '2025-10-01')
             end_date: ISO format date
             limit: Maximum records to return
+            columns: Columns to return (None = all); only these are read
         """
+        try:
+            # One day of slack either side so timezone offsets between the
+            # query and the partitioning date never prune a matching file
+            source = self._parquet_source(
+                datetime.fromisoformat(start_date) - timedelta(days=1),
+                datetime.fromisoformat(end_date) + timedelta(days=1)
+            )
+        except ValueError:
+            # Let DuckDB parse and report unusual date formats
+            source = "all_records"
+
         query = f"""
-            SELECT * FROM all_records
-            WHERE {DATE_FIELD} >= '{start_date}'
-              AND {DATE_FIELD} < '{end_date}'
+            SELECT {_select_list(columns)} FROM {source}
+            WHERE {DATE_FIELD} >= ?
+              AND {DATE_FIELD} < ?
             ORDER BY {DATE_FIELD} DESC
-            LIMIT {limit}
+            LIMIT {int(limit)}
+        """
+        return self.execute_sql(query, cursor=cursor, params=[start_date, end_date])
+
+    def breakdown_by(
+        self,
+        column: str,
+        start_date: str,
+        end_date: str,
+        cursor=None
+    ) -> Dict[str, Any]:
+        """
+        Count records per value of a column within a date range
+
+        Aggregated by DuckDB in one GROUP BY, so no rows are materialized.
+
+        Args:
+            column: Column to group by (e.g. data_type)
+            start_date: ISO format date (inclusive)
+            end_date: ISO format date (exclusive, as in query_by_date_range)
         """
-        return self.execute_sql(query)
+        try:
+            source = self._parquet_source(
+                datetime.fromisoformat(start_date) - timedelta(days=1),
+                datetime.fromisoformat(end_date) + timedelta(days=1)
+            )
+        except ValueError:
+            source = "all_records"
+
+        group_column = _quote_identifier(column)
+        query = f"""
+            SELECT {group_column} AS value, COUNT(*) AS count
+            FROM {source}
+            WHERE {DATE_FIELD} >= ?
+              AND {DATE_FIELD} < ?
+            GROUP BY {group_column}
+            ORDER BY count DESC
+        """
+        try:
+            self._register_parquet_view()
+            start_time = time.perf_counter()
+            table = self._cursor(cursor).execute(query, [start_date, end_date]).fetch_arrow_table()
+            duration = time.perf_counter() - start_time
+        except Exception as e:
+            logger.error(f"❌ Query failed: {e}")
+            return {"status": "error", "message": str(e), "query": query}
+
+        # Read the two result columns straight from Arrow: no per-row dicts
+        counts = table.column("count")
+        return {
+            "status": "success",
+            "breakdown": dict(zip(table.column("value").to_pylist(), counts.to_pylist())),
+            "total_records": pc.sum(counts).as_py() or 0,
+            "duration_seconds": round(duration, 3),
+            "query": query
+        }
 
     def query_recent(
         self,
         hours: int = 24,
-        limit: int = DEFAULT_LIMIT
+        limit: int = DEFAULT_LIMIT,
+        cursor=None,
+        columns: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """Query records from last N hours"""
+        """Query records from last N hours (optionally only some columns)"""
+        # One day of slack so timezone offsets never prune a matching month
+        since = datetime.now() - timedelta(hours=hours, days=1)
+
         query = f"""
-            SELECT * FROM all_records
-            WHERE {DATE_FIELD} >= NOW() - INTERVAL '{hours} hours'
+            SELECT {_select_list(columns)} FROM {self._parquet_source(start_date=since)}
+            WHERE {DATE_FIELD} >= NOW() - INTERVAL '{int(hours)} hours'
             ORDER BY {DATE_FIELD} DESC
-            LIMIT {limit}
+            LIMIT {int(limit)}
         """
-        return self.execute_sql(query)
+        return self.execute_sql(query, cursor=cursor)
 
-    def get_statistics(self) -> Dict[str, Any]:
+    def get_statistics(self, cursor=None) -> Dict[str, Any]:
         """Get comprehensive dataset statistics"""
         try:
             # Refresh view to include new files
             self._register_parquet_view()
+            connection = self._cursor(cursor)
 
             stats = {}
 
-            # Total records
-            total_query = "SELECT COUNT(*) as total FROM all_records"
-            total_result = self.connection.execute(total_query).fetchone()
-            stats['total_records'] = total_result[0] if total_result else 0
+            # Totals, date range and weekly distribution in one scan: rows
+            # are grouped by week once and everything else derives from that
+            summary_query = f"""
+                WITH weeks AS (
+                    SELECT
+                        DATE_TRUNC('week', {DATE_FIELD}) AS week,
+                        COUNT(*) AS count,
+                        MIN({DATE_FIELD}) AS earliest,
+                        MAX({DATE_FIELD}) AS latest
+                    FROM all_records
+                    GROUP BY week
+                )
+                SELECT
+                    COALESCE(SUM(count), 0)::BIGINT AS total,
+                    MIN(earliest) AS earliest,
+                    MAX(latest) AS latest,
+                    list({{'week': week, 'count': count}} ORDER BY week DESC)[1:10] AS weekly
+                FROM weeks
+            """
+            # Through Arrow: Python-object conversion of TIMESTAMPTZ needs pytz
+            summary = _fetch_rows(connection.execute(summary_query))[0][0]
+            stats['total_records'] = summary['total']
 
             if stats['total_records'] == 0:
                 return {
@@ -263,36 +1031,14 @@ class DuckDBQueryEngine:
                     }
                 }
 
-            # Date range
-            date_query = f"""
-                SELECT
-                    MIN({DATE_FIELD}) as earliest,
-                    MAX({DATE_FIELD}) as latest
-                FROM all_records
-            """
-            date_result = self.connection.execute(date_query).fetchone()
             stats['date_range'] = {
-                'earliest': str(date_result[0]),
-                'latest': str(date_result[1])
+                'earliest': str(summary['earliest']),
+                'latest': str(summary['latest'])
             }
-
-            # Weekly distribution
-            weekly_query = f"""
-                SELECT
-                    DATE_TRUNC('week', {DATE_FIELD}) as week,
-                    COUNT(*) as count
-                FROM all_records
-                GROUP BY week
-                ORDER BY week DESC
-                LIMIT 10
-            """
-            weekly_result = self.connection.execute(weekly_query).fetchdf()
-            stats['weekly_distribution'] = weekly_result.to_dict(orient='records')
+            stats['weekly_distribution'] = summary['weekly']
 
             # Column info
-            columns_query = "DESCRIBE all_records"
-            columns_result = self.connection.execute(columns_query).fetchdf()
-            stats['schema'] = columns_result.to_dict(orient='records')
+            stats['schema'] = self._describe(connection)
 
             return {
                 "status": "success",
@@ -310,70 +1056,98 @@ class DuckDBQueryEngine:
         self,
         search_term: str,
         column: str = None,
-        limit: int = DEFAULT_LIMIT
+        limit: int = DEFAULT_LIMIT,
+        cursor=None,
+        columns: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Full-text search across records
 
+        Results are cached per (term, column, limit, columns); matching is
+        case-insensitive, so the term is normalized to lower case.
+
         Args:
             search_term: Text to search for
             column: Specific column to search (None = all columns)
             limit: Maximum results
+            cursor: Pooled cursor to run on (defaults to the base connection)
+            columns: Columns to return (None = all)
         """
+        # Drops the cache and FTS index first if another process wrote
+        self.data_version()
+        cache_key = (search_term.lower(), column or '', limit, tuple(columns or ()))
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._search(search_term, column, limit, cursor, columns)
+        if result["status"] == "success":
+            self.search_cache.set(cache_key, result)
+        return result
+
+    def _search(
+        self,
+        search_term: str,
+        column: Optional[str],
+        limit: int,
+        cursor=None,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Run an uncached search, ranked by BM25 when the index is current"""
+        if self._fts_ready() and (column is None or column in self._fts_columns):
+            try:
+                return self._fts_search(search_term, column, limit, cursor, columns)
+            except Exception as e:
+                logger.warning(f"⚠️ Full-text search failed, scanning columns: {e}")
+
         try:
             # Refresh view
             self._register_parquet_view()
+            connection = self._cursor(cursor)
 
-            # Escape search term to prevent SQL injection
-            # Replace single quotes with double single quotes
-            escaped_term = search_term.replace("'", "''")
+            # The term is bound once as $1, never spliced into the SQL, and
+            # matched as a plain substring: contains() on lower-cased text is
+            # cheaper than ILIKE's pattern matching, evaluated on every column
+            params = [search_term.lower()]
 
             if column:
-                # Search specific column - use parameterized approach
+                # Search specific column
                 query = f"""
-                    SELECT * FROM all_records
-                    WHERE CAST({column} AS VARCHAR) ILIKE '%{escaped_term}%'
-                    LIMIT {limit}
+                    SELECT {_select_list(columns)} FROM all_records
+                    WHERE contains(lower(CAST({_quote_identifier(column)} AS VARCHAR)), $1)
+                    LIMIT {int(limit)}
                 """
             else:
-                # Get all columns and search across them
-                columns_query = "DESCRIBE all_records"
-                columns_df = self.connection.execute(columns_query).fetchdf()
-
                 # Filter for text-like columns (VARCHAR, TEXT, or any string type)
-                text_columns = []
-                for idx, row in columns_df.iterrows():
-                    col_type = str(row['column_type']).upper()
-                    if any(t in col_type for t in ['VARCHAR', 'TEXT', 'STRING', 'CHAR']):
-                        text_columns.append(row['column_name'])
+                text_columns = self._text_columns(connection)
 
                 if not text_columns:
                     # If no text columns found, search all columns by casting
-                    text_columns = columns_df['column_name'].tolist()
+                    text_columns = [row['column_name'] for row in self._describe(connection)]
 
                 # Build search conditions for each column
                 where_clauses = [
-                    f"CAST({col} AS VARCHAR) ILIKE '%{escaped_term}%'"
+                    f"contains(lower(CAST({_quote_identifier(col)} AS VARCHAR)), $1)"
                     for col in text_columns
                 ]
                 where_condition = " OR ".join(where_clauses)
 
                 query = f"""
-                    SELECT * FROM all_records
+                    SELECT {_select_list(columns)} FROM all_records
                     WHERE {where_condition}
-                    LIMIT {limit}
+                    LIMIT {int(limit)}
                 """
 
             # Don't call execute_sql to avoid double view refresh
-            start_time = datetime.now()
-            result = self.connection.execute(query).fetchdf()
-            duration = (datetime.now() - start_time).total_seconds()
+            start_time = time.perf_counter()
+            rows, columns = _fetch_rows(connection.execute(query, params))
+            duration = time.perf_counter() - start_time
 
             return {
                 "status": "success",
-                "data": result.to_dict(orient='records'),
-                "row_count": len(result),
-                "columns": list(result.columns),
+                "data": rows,
+                "row_count": len(rows),
+                "columns": columns,
                 "duration_seconds": round(duration, 3),
                 "query": query
             }
@@ -385,11 +1159,61 @@ class DuckDBQueryEngine:
                 "message": str(e)
             }
 
+    def _fts_search(
+        self,
+        search_term: str,
+        column: Optional[str],
+        limit: int,
+        cursor=None,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """BM25-ranked search through the full-text index"""
+        self._register_parquet_view()
+        connection = self._cursor(cursor)
+
+        fields = ""
+        if column:
+            fields = ", fields := '" + column.replace("'", "''") + "'"
+
+        # Top-scoring IDs come from the index; only those rows are read back
+        query = f"""
+            WITH hits AS (
+                SELECT {ID_FIELD}, score FROM (
+                    SELECT {ID_FIELD},
+                           fts_main_search_corpus.match_bm25({ID_FIELD}, ?{fields}) AS score
+                    FROM search_corpus
+                )
+                WHERE score IS NOT NULL
+                ORDER BY score DESC
+                LIMIT {limit}
+            )
+            SELECT {_select_list(columns, alias="r")}, hits.score
+            FROM all_records r
+            JOIN hits ON CAST(r.{ID_FIELD} AS VARCHAR) = hits.{ID_FIELD}
+            ORDER BY hits.score DESC
+            LIMIT {limit}
+        """
+
+        start_time = time.perf_counter()
+        rows, columns = _fetch_rows(connection.execute(query, [search_term]))
+        duration = time.perf_counter() - start_time
+
+        return {
+            "status": "success",
+            "data": rows,
+            "row_count": len(rows),
+            "columns": columns,
+            "duration_seconds": round(duration, 3),
+            "query": query
+        }
+
     def aggregate(
         self,
         group_by: str,
         agg_function: str = "COUNT",
-        agg_column: str = "*"
+        agg_column: str = "*",
+        cursor=None,
+        approximate: bool = False
     ) -> Dict[str, Any]:
         """
         Perform aggregation query
@@ -398,7 +1222,18 @@ class DuckDBQueryEngine:
             group_by: Column to group by
             agg_function: Aggregation function (COUNT, SUM, AVG, etc.)
             agg_column: Column to aggregate
+            approximate: For COUNT(*) only, return the 100 most frequent
+                         groups from one approx_top_k pass, most frequent
+                         first. Rows then hold only the group_by column (no
+                         result counts), and NULL is never a group.
         """
+        if approximate and agg_function.upper() == "COUNT" and agg_column == "*":
+            query = f"""
+                SELECT unnest(approx_top_k({group_by}, 100)) AS {group_by}
+                FROM all_records
+            """
+            return self.execute_sql(query, cursor=cursor)
+
         query = f"""
             SELECT
                 {group_by},
@@ -408,13 +1243,13 @@ class DuckDBQueryEngine:
             ORDER BY result DESC
             LIMIT 100
         """
-        return self.execute_sql(query)
+        return self.execute_sql(query, cursor=cursor)
 
     def close(self):
         """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            logger.info("🔌 DuckDB connection closed")
+        self._index_executor.shutdown(wait=True)
+        self.pool.close_all()
+        self.connection = None
 
 
 # Singleton instance
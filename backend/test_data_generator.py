@@ -2,11 +2,16 @@
 Test data generator for DuckParqStream
 Generates realistic JSON data for testing and benchmarking
 """
+import os
 import random
 import string
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Optional
+import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
 
 
@@ -74,9 +79,9 @@ class TestDataGenerator:
             'severity': random.choice(severity_levels),
             'message': f'Event {event_id} occurred',
             'metadata': {
-                'ip_address': f'{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}',
+                'ip_address': '.'.join(map(str, os.urandom(4))),
                 'user_agent': 'Mozilla/5.0',
-                'session_id': ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+                'session_id': os.urandom(16).hex()
             },
             'timestamp': (
                 datetime.now() - timedelta(minutes=random.randint(0, 10080))
@@ -139,19 +144,185 @@ class TestDataGenerator:
         Returns:
             List of generated records
         """
-        generators = {
-            'user': self.generate_user_record,
-            'transaction': self.generate_transaction_record,
-            'event': self.generate_event_record,
-            'product': self.generate_product_record,
-            'sensor': self.generate_sensor_data
+        return self.generate_batch_vectorized(record_type, count, start_id)
+
+    def generate_batch_vectorized(
+        self,
+        record_type: str = 'user',
+        count: int = 1000,
+        start_id: int = 1,
+        seed: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate a batch of records from NumPy-generated columns
+
+        Same record shapes as the generate_*_record methods, but every
+        field is drawn for the whole batch in one call.
+        """
+        columns = self.generate_batch_columns(record_type, count, start_id, seed)
+        names = list(columns)
+        values = [
+            column.tolist() if isinstance(column, np.ndarray)
+            else column.to_pylist() if isinstance(column, pa.Array)
+            else column
+            for column in columns.values()
+        ]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def generate_batch_columns(
+        self,
+        record_type: str = 'user',
+        count: int = 1000,
+        start_id: int = 1,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a batch as columns (NumPy or Arrow arrays; nested fields as lists)
+
+        Args:
+            record_type: Type of records to generate
+            count: Number of records to generate
+            start_id: Starting ID for records
+            seed: Seed for reproducible batches
+        """
+        builders = {
+            'user': self._user_columns,
+            'transaction': self._transaction_columns,
+            'event': self._event_columns,
+            'product': self._product_columns,
+            'sensor': self._sensor_columns
         }
 
-        if record_type not in generators:
+        if record_type not in builders:
             raise ValueError(f"Unknown record type: {record_type}")
 
-        generator = generators[record_type]
-        return [generator(start_id + i) for i in range(count)]
+        rng = np.random.default_rng(seed)
+        ids = np.arange(start_id, start_id + count)
+        return builders[record_type](rng, ids)
+
+    def _ids(self, prefix: str, ids: np.ndarray) -> np.ndarray:
+        return np.char.add(prefix, ids.astype(str))
+
+    def _timestamps(self, rng: np.random.Generator, count: int, max_ago: int, unit: str) -> np.ndarray:
+        """ISO timestamps up to max_ago units before now"""
+        now = np.datetime64(datetime.now(), 'us')
+        ago = rng.integers(0, max_ago, size=count, endpoint=True).astype(f'timedelta64[{unit}]')
+        return np.datetime_as_string(now - ago, unit='us')
+
+    def _pick(self, rng: np.random.Generator, values: List[str], count: int) -> pa.Array:
+        """Random choice as an Arrow take: no per-row NumPy strings to convert"""
+        return pa.array(values).take(rng.integers(0, len(values), size=count))
+
+    def _user_columns(self, rng: np.random.Generator, ids: np.ndarray) -> Dict[str, Any]:
+        count = len(ids)
+        first_index = rng.integers(0, len(self.first_names), size=count)
+        last_index = rng.integers(0, len(self.last_names), size=count)
+        record_ids = self._ids('user_', ids)
+        # Every email is one of len(first) * len(last) strings: build those
+        # once and take by the combined index instead of concatenating per row
+        emails = pa.array([
+            f"{first.lower()}.{last.lower()}@example.com"
+            for first in self.first_names for last in self.last_names
+        ]).take(first_index * len(self.last_names) + last_index)
+        return {
+            'id': record_ids,
+            'record_id': record_ids,
+            'first_name': pa.array(self.first_names).take(first_index),
+            'last_name': pa.array(self.last_names).take(last_index),
+            'email': emails,
+            'age': rng.integers(18, 80, size=count, endpoint=True),
+            'country': self._pick(rng, self.countries, count),
+            'status': self._pick(rng, self.statuses, count),
+            'balance': np.round(rng.uniform(0, 10000, size=count), 2),
+            'created_at': self._timestamps(rng, count, 365, 'D')
+        }
+
+    def _transaction_columns(self, rng: np.random.Generator, ids: np.ndarray) -> Dict[str, Any]:
+        count = len(ids)
+        record_ids = self._ids('txn_', ids)
+        return {
+            'id': record_ids,
+            'record_id': record_ids,
+            'user_id': self._ids('user_', rng.integers(1, 1000, size=count, endpoint=True)),
+            'amount': np.round(rng.uniform(1, 1000, size=count), 2),
+            'currency': rng.choice(['USD', 'EUR', 'GBP', 'JPY'], size=count),
+            'category': rng.choice(self.categories, size=count),
+            'status': rng.choice(['completed', 'pending', 'failed'], size=count),
+            'timestamp': self._timestamps(rng, count, 720, 'h')
+        }
+
+    def _event_columns(self, rng: np.random.Generator, ids: np.ndarray) -> Dict[str, Any]:
+        count = len(ids)
+        record_ids = self._ids('event_', ids)
+        octets = rng.integers(1, 255, size=(4, count), endpoint=True).astype(str)
+        ip_addresses = octets[0]
+        for octet in octets[1:]:
+            ip_addresses = np.char.add(np.char.add(ip_addresses, '.'), octet)
+        # 32 random alphanumerics per row as one fixed-width byte string
+        alphabet = np.frombuffer((string.ascii_letters + string.digits).encode(), dtype=np.uint8)
+        session_ids = (
+            alphabet[rng.integers(0, len(alphabet), size=(count, 32))]
+            .view('S32').ravel().astype(str).tolist()
+        )
+        return {
+            'id': record_ids,
+            'record_id': record_ids,
+            'event_type': rng.choice(['login', 'logout', 'purchase', 'view', 'click', 'error'], size=count),
+            'user_id': self._ids('user_', rng.integers(1, 1000, size=count, endpoint=True)),
+            'severity': rng.choice(['info', 'warning', 'error', 'critical'], size=count),
+            'message': np.char.add(np.char.add('Event ', ids.astype(str)), ' occurred'),
+            'metadata': [
+                {'ip_address': ip, 'user_agent': 'Mozilla/5.0', 'session_id': session_id}
+                for ip, session_id in zip(ip_addresses.tolist(), session_ids)
+            ],
+            'timestamp': self._timestamps(rng, count, 10080, 'm')
+        }
+
+    def _product_columns(self, rng: np.random.Generator, ids: np.ndarray) -> Dict[str, Any]:
+        count = len(ids)
+        record_ids = self._ids('prod_', ids)
+        tag_choices = np.array(['new', 'sale', 'popular', 'limited', 'bestseller'])
+        # Random subset of 0-3 tags per product: first k of a random permutation
+        tag_order = rng.permuted(np.tile(np.arange(len(tag_choices)), (count, 1)), axis=1)
+        tag_counts = rng.integers(0, 3, size=count, endpoint=True)
+        return {
+            'id': record_ids,
+            'record_id': record_ids,
+            'name': np.char.add('Product ', ids.astype(str)),
+            'category': rng.choice(self.categories, size=count),
+            'price': np.round(rng.uniform(1, 500, size=count), 2),
+            'stock': rng.integers(0, 1000, size=count, endpoint=True),
+            'rating': np.round(rng.uniform(1, 5, size=count), 1),
+            'reviews_count': rng.integers(0, 500, size=count, endpoint=True),
+            'is_available': rng.random(size=count) < 0.5,
+            'tags': [
+                tag_choices[order[:k]].tolist()
+                for order, k in zip(tag_order, tag_counts)
+            ],
+            'created_at': self._timestamps(rng, count, 730, 'D')
+        }
+
+    def _sensor_columns(self, rng: np.random.Generator, ids: np.ndarray) -> Dict[str, Any]:
+        count = len(ids)
+        record_ids = self._ids('sensor_', ids)
+        sensor_numbers = np.char.zfill(rng.integers(1, 100, size=count, endpoint=True).astype(str), 3)
+        latitudes = np.round(rng.uniform(-90, 90, size=count), 6)
+        longitudes = np.round(rng.uniform(-180, 180, size=count), 6)
+        return {
+            'id': record_ids,
+            'record_id': record_ids,
+            'sensor_id': np.char.add('SENSOR_', sensor_numbers),
+            'temperature': np.round(rng.uniform(-20, 50, size=count), 2),
+            'humidity': np.round(rng.uniform(0, 100, size=count), 2),
+            'pressure': np.round(rng.uniform(950, 1050, size=count), 2),
+            'battery_level': np.round(rng.uniform(0, 100, size=count), 1),
+            'location': [
+                {'lat': lat, 'lon': lon}
+                for lat, lon in zip(latitudes.tolist(), longitudes.tolist())
+            ],
+            'status': rng.choice(['online', 'offline', 'maintenance'], size=count),
+            'timestamp': self._timestamps(rng, count, 3600, 's')
+        }
 
     def save_to_file(
         self,
@@ -165,27 +336,92 @@ class TestDataGenerator:
         Args:
             records: List of records to save
             filepath: Output file path
-            format: 'json' or 'jsonl'
+            format: 'json', 'jsonl' or 'parquet'
         """
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        if format == 'json':
-            with open(filepath, 'w') as f:
-                json.dump(records, f, indent=2)
+        if format == 'parquet':
+            self._write_parquet(pa.Table.from_pylist(records), filepath)
+        elif format == 'json':
+            # Compact orjson output: no indentation bytes to write or parse
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(records, option=orjson.OPT_SERIALIZE_NUMPY))
         elif format == 'jsonl':
-            with open(filepath, 'w') as f:
-                for record in records:
-                    f.write(json.dumps(record) + '\n')
+            with open(filepath, 'wb') as f:
+                f.writelines(
+                    orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+                    for record in records
+                )
         else:
             raise ValueError(f"Unknown format: {format}")
 
+    def generate_batch_table(
+        self,
+        record_type: str = 'user',
+        count: int = 1000,
+        start_id: int = 1,
+        seed: Optional[int] = None
+    ) -> pa.Table:
+        """
+        Generate a batch as an Arrow table, ready for append_table
+
+        The NumPy columns go straight into Arrow arrays, so no per-record
+        dicts are built.
+        """
+        return self._columns_to_table(
+            self.generate_batch_columns(record_type, count, start_id, seed)
+        )
+
+    def _columns_to_table(self, columns: Dict[str, Any]) -> pa.Table:
+        return pa.table({
+            name: column if isinstance(column, pa.Array) else pa.array(column)
+            for name, column in columns.items()
+        })
+
+    def save_to_parquet(self, columns: Dict[str, Any], filepath: Path):
+        """
+        Save a columnar batch (from generate_batch_columns) as Parquet
+
+        The NumPy columns go straight into Arrow arrays, so no per-record
+        dicts or JSON text are built.
+        """
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._write_parquet(self._columns_to_table(columns), filepath)
+
+    def _write_parquet(self, table: pa.Table, filepath: Path):
+        # Sorted by time, each 128k-row group covers a narrow, non-overlapping
+        # time range, so min/max statistics let date filters skip groups
+        time_column = next(
+            (name for name in ('timestamp', 'created_at') if name in table.column_names),
+            None
+        )
+        if time_column:
+            table = table.sort_by([(time_column, 'ascending')])
+
+        # Sequential IDs share long prefixes: delta strings beat a dictionary
+        delta_columns = [name for name in ('id', 'record_id') if name in table.column_names]
+
+        pq.write_table(
+            table,
+            filepath,
+            compression='zstd',
+            use_dictionary=[name for name in table.column_names if name not in delta_columns],
+            column_encoding={name: 'DELTA_BYTE_ARRAY' for name in delta_columns},
+            row_group_size=128 * 1024,
+            data_page_size=1 << 20,
+            write_statistics=True
+        )
+
     def generate_large_dataset(
         self,
         record_type: str,
         total_records: int,
         batch_size: int = 10000,
-        output_dir: Path = None
+        output_dir: Path = None,
+        format: str = 'json',
+        workers: Optional[int] = None
     ):
         """
         Generate large dataset in batches and save to files
@@ -195,6 +431,9 @@ class TestDataGenerator:
             total_records: Total number of records
             batch_size: Records per file
             output_dir: Directory to save files
+            format: 'json', 'jsonl' or 'parquet' (written from columns
+                    directly, the fastest and smallest option)
+            workers: Worker processes (None = one per CPU, 1 = in-process)
 
         Returns:
             List of generated file paths
@@ -208,21 +447,59 @@ class TestDataGenerator:
         file_paths = []
         batches = (total_records + batch_size - 1) // batch_size
 
-        for batch_num in range(batches):
-            start_id = batch_num * batch_size + 1
-            count = min(batch_size, total_records - batch_num * batch_size)
+        # Batches are independent, so each one is generated and written in
+        # its own process; seeding by batch number keeps output reproducible
+        batch_args = [
+            (
+                record_type,
+                min(batch_size, total_records - batch_num * batch_size),
+                batch_num * batch_size + 1,
+                output_dir / f'{record_type}_batch_{batch_num + 1}.{format}',
+                format,
+                batch_num
+            )
+            for batch_num in range(batches)
+        ]
 
-            records = self.generate_batch(record_type, count, start_id)
+        if workers == 1 or batches == 1:
+            results = map(_generate_and_write_batch, batch_args)
+            self._report_batches(results, batches, file_paths)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_generate_and_write_batch, batch_args)
+                self._report_batches(results, batches, file_paths)
 
-            filename = f'{record_type}_batch_{batch_num + 1}.json'
-            filepath = output_dir / filename
+        return file_paths
 
-            self.save_to_file(records, filepath, format='json')
+    def _report_batches(self, results, batches: int, file_paths: List[Path]):
+        for batch_num, (filepath, count) in enumerate(results):
             file_paths.append(filepath)
-
             print(f"Generated batch {batch_num + 1}/{batches}: {filepath} ({count} records)")
 
-        return file_paths
+    def write_batch(
+        self,
+        record_type: str,
+        count: int,
+        start_id: int,
+        filepath: Path,
+        format: str = 'json',
+        seed: Optional[int] = None
+    ) -> Path:
+        """Generate one batch and save it in the given format"""
+        if format == 'parquet':
+            columns = self.generate_batch_columns(record_type, count, start_id, seed)
+            self.save_to_parquet(columns, filepath)
+        else:
+            records = self.generate_batch_vectorized(record_type, count, start_id, seed)
+            self.save_to_file(records, filepath, format=format)
+        return filepath
+
+
+def _generate_and_write_batch(args) -> tuple:
+    """Process-pool worker: a fresh generator per process, nothing shared"""
+    record_type, count, start_id, filepath, format, seed = args
+    TestDataGenerator().write_batch(record_type, count, start_id, filepath, format, seed)
+    return filepath, count
 
 
 # CLI interface
@@ -250,7 +527,7 @@ if __name__ == '__main__':
     )
     parser.add_argument(
         '--format',
-        choices=['json', 'jsonl'],
+        choices=['json', 'jsonl', 'parquet'],
         default='json',
         help='Output format'
     )
@@ -260,6 +537,12 @@ if __name__ == '__main__':
         default=10000,
         help='Records per batch for large datasets'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Processes for large datasets (default: one per CPU)'
+    )
 
     args = parser.parse_args()
 
@@ -277,6 +560,8 @@ if __name__ == '__main__':
             args.type,
             args.count,
             args.batch_size,
-            output_dir
+            output_dir,
+            args.format,
+            args.workers
         )
         print(f"✅ Generated {args.count} records across {len(file_paths)} files")
@@ -6,10 +6,12 @@ import sys
 import io
 from pathlib import Path
 
-# Set UTF-8 encoding for Windows console
+# Set UTF-8 encoding for Windows console (skipped when it already is UTF-8,
+# e.g. under -X utf8 or PYTHONIOENCODING); reconfigure keeps line buffering
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    for stream in (sys.stdout, sys.stderr):
+        if (stream.encoding or '').lower().replace('-', '') != 'utf8':
+            stream.reconfigure(encoding='utf-8', errors='replace')
 
 # Add backend to path
 backend_dir = Path(__file__).parent / 'backend'
@@ -18,23 +20,35 @@ sys.path.insert(0, str(backend_dir))
 from ingestion import ingestion_engine
 from query_engine import query_engine
 from test_data_generator import TestDataGenerator
-import json
-from datetime import datetime
-import pandas as pd
+from db_pool import db_pool
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from decimal import Decimal
+import orjson
 
 
 def json_serial(obj):
-    """JSON serializer for objects not serializable by default"""
-    if isinstance(obj, (pd.Timestamp, datetime)):
+    """Fallback for values orjson cannot encode itself (datetimes it handles)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, 'isoformat'):
         return obj.isoformat()
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
+def dumps(obj) -> str:
+    """Pretty-print a record with orjson's C encoder"""
+    return orjson.dumps(
+        obj, default=json_serial, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+SEPARATOR = "=" * 60
+
+
 def print_section(title):
     """Print formatted section header"""
-    print("\n" + "=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    sys.stdout.write(f"\n{SEPARATOR}\n  {title}\n{SEPARATOR}\n")
 
 
 def example_basic_ingestion():
@@ -86,12 +100,12 @@ def example_batch_generation():
 
     generator = TestDataGenerator()
 
-    # Generate 10,000 user records
+    # Generate 10,000 user records column by column, straight into Arrow
     print("🔄 Generating 10,000 user records...")
-    records = generator.generate_batch('user', count=10000)
+    table = generator.generate_batch_table('user', count=10000)
 
     print("💾 Ingesting batch...")
-    result = ingestion_engine.append_to_parquet(records)
+    result = ingestion_engine.append_table(table)
 
     print(f"\n✅ Result:")
     print(f"   Records: {result['records_processed']:,}")
@@ -99,45 +113,26 @@ def example_batch_generation():
     print(f"   Duration: {result['duration_seconds']}s")
 
 
-def example_sql_queries():
+def example_sql_queries(cursor=None):
     """Example 3: SQL queries"""
     print_section("Example 3: SQL Queries")
 
-    # Query 1: Select all
-    print("\n🔍 Query 1: First 5 records")
-    result1 = query_engine.execute_sql(
-        "SELECT * FROM all_records LIMIT 5"
-    )
-    print(f"   Found {result1['row_count']} records in {result1['duration_seconds']}s")
-    if result1['data']:
-        print(f"   Sample: {json.dumps(result1['data'][0], indent=2, default=json_serial)}")
-
-    # Query 2: Count records
-    print("\n🔍 Query 2: Total record count")
-    result2 = query_engine.execute_sql(
-        "SELECT COUNT(*) as total FROM all_records"
-    )
-    if result2['data']:
-        print(f"   Total Records: {result2['data'][0]['total']:,}")
-
-    # Query 3: Aggregation
-    print("\n🔍 Query 3: Count by country")
-    result3 = query_engine.execute_sql("""
+    result1, result2, result3, result4 = query_engine.execute_batch([
+        # Query 1: Select all
+        "SELECT * FROM all_records LIMIT 5",
+        # Query 2: Count records
+        "SELECT COUNT(*) as total FROM all_records",
+        # Query 3: Aggregation
+        """
         SELECT country, COUNT(*) as count
         FROM all_records
         WHERE country IS NOT NULL
         GROUP BY country
         ORDER BY count DESC
         LIMIT 5
-    """)
-    if result3['data']:
-        print("   Top countries:")
-        for row in result3['data']:
-            print(f"     - {row['country']}: {row['count']:,} records")
-
-    # Query 4: Average calculation
-    print("\n🔍 Query 4: Average balance by country")
-    result4 = query_engine.execute_sql("""
+        """,
+        # Query 4: Average calculation
+        """
         SELECT
             country,
             ROUND(AVG(balance), 2) as avg_balance,
@@ -148,42 +143,61 @@ def example_sql_queries():
         GROUP BY country
         ORDER BY avg_balance DESC
         LIMIT 5
-    """)
-    if result4['data']:
+        """
+    ], cursor=cursor)
+
+    print("\n🔍 Query 1: First 5 records")
+    if result1['status'] == 'success':
+        print(f"   Found {result1['row_count']} records in {result1['duration_seconds']}s")
+    if result1.get('data'):
+        print(f"   Sample: {dumps(result1['data'][0])}")
+
+    print("\n🔍 Query 2: Total record count")
+    if result2.get('data'):
+        print(f"   Total Records: {result2['data'][0]['total']:,}")
+
+    print("\n🔍 Query 3: Count by country")
+    if result3.get('data'):
+        print("   Top countries:")
+        for row in result3['data']:
+            print(f"     - {row['country']}: {row['count']:,} records")
+
+    print("\n🔍 Query 4: Average balance by country")
+    if result4.get('data'):
         print("   Average balances:")
         for row in result4['data']:
             print(f"     - {row['country']}: ${row['avg_balance']} ({row['user_count']} users)")
 
 
-def example_search_and_filter():
+def example_search_and_filter(cursor=None):
     """Example 4: Search and filtering"""
     print_section("Example 4: Search and Filter")
 
     # Search by ID
     print("\n🔍 Search by ID: user_001")
-    result1 = query_engine.query_by_id("user_001")
+    result1 = query_engine.query_by_id("user_001", cursor=cursor)
     if result1['row_count'] > 0:
-        print(f"   Found: {json.dumps(result1['data'][0], indent=2, default=json_serial)}")
+        print(f"   Found: {dumps(result1['data'][0])}")
     else:
         print("   Record not found")
 
     # Search by text
     print("\n🔍 Full-text search: 'alice'")
-    result2 = query_engine.search("alice", limit=5)
+    result2 = query_engine.search("alice", limit=5, cursor=cursor)
     print(f"   Found {result2['row_count']} matching records")
 
     # Filter by date
     print("\n🔍 Recent records (last 24 hours)")
-    result3 = query_engine.query_recent(hours=24, limit=5)
+    result3 = query_engine.query_recent(hours=24, limit=5, cursor=cursor)
     print(f"   Found {result3['row_count']} recent records")
 
 
-def example_statistics():
+def example_statistics(cursor=None):
     """Example 5: Dataset statistics"""
     print_section("Example 5: Dataset Statistics")
 
     # Get comprehensive stats
-    stats = query_engine.get_statistics()
+    stats = query_engine.get_statistics(cursor)
 
     if stats['status'] == 'success':
         stat_data = stats['statistics']
@@ -211,19 +225,22 @@ def example_statistics():
     total_size = 0
     total_rows = 0
 
+    # One write for the whole listing rather than three prints per file
+    lines = []
     for file_info in files:
-        print(f"   - {file_info['filename']}:")
-        print(f"       Rows: {file_info['row_count']:,}")
-        print(f"       Size: {file_info['file_size_mb']:.2f} MB")
+        lines.append(f"   - {file_info['filename']}:")
+        lines.append(f"       Rows: {file_info['row_count']:,}")
+        lines.append(f"       Size: {file_info['file_size_mb']:.2f} MB")
         total_size += file_info['file_size_mb']
         total_rows += file_info['row_count']
 
-    print(f"\n   Total Files: {len(files)}")
-    print(f"   Total Rows: {total_rows:,}")
-    print(f"   Total Size: {total_size:.2f} MB")
+    lines.append(f"\n   Total Files: {len(files)}")
+    lines.append(f"   Total Rows: {total_rows:,}")
+    lines.append(f"   Total Size: {total_size:.2f} MB")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def example_advanced_analytics():
+def example_advanced_analytics(cursor=None):
     """Example 6: Advanced analytics"""
     print_section("Example 6: Advanced Analytics")
 
@@ -238,7 +255,7 @@ def example_advanced_analytics():
             ROUND(MAX(balance), 2) as max
         FROM all_records
         WHERE balance IS NOT NULL
-    """)
+    """, cursor=cursor)
 
     if result['data']:
         stats = result['data'][0]
@@ -252,12 +269,13 @@ def example_advanced_analytics():
     print("\n📈 Records by hour of day")
     result2 = query_engine.execute_sql("""
         SELECT
-            EXTRACT(HOUR FROM ingested_at) as hour,
+            -- Files written before ingested_hour existed fall back to EXTRACT
+            COALESCE(ingested_hour, EXTRACT(HOUR FROM ingested_at AT TIME ZONE 'UTC')) as hour,
             COUNT(*) as count
         FROM all_records
         GROUP BY hour
         ORDER BY hour
-    """)
+    """, cursor=cursor)
 
     if result2['data'] and len(result2['data']) > 0:
         print("   Hourly distribution:")
@@ -265,20 +283,56 @@ def example_advanced_analytics():
             print(f"     - Hour {int(row['hour']):02d}:00: {row['count']:,} records")
 
 
+class _SectionOutput:
+    """sys.stdout stand-in that sends each worker thread's prints to its own buffer"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def run_read_examples(examples):
+    """Run read-only examples in parallel, printing each section in order"""
+    output = _SectionOutput(sys.stdout)
+
+    def run(example):
+        output.local.buffer = io.StringIO()
+        with db_pool.cursor() as cursor:
+            example(cursor)
+        return output.local.buffer.getvalue()
+
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(examples), db_pool.size)) as executor:
+            sections = [executor.submit(run, example) for example in examples]
+            for section in sections:
+                output.stream.write(section.result())
+    finally:
+        sys.stdout = output.stream
+
+
 def run_all_examples():
     """Run all examples in sequence"""
-    print("\n" + "=" * 60)
-    print("  🦆 DuckParqStream - Complete Examples")
-    print("=" * 60)
+    print_section("🦆 DuckParqStream - Complete Examples")
 
     try:
-        # Run examples
+        # Ingestion first, in order; the read-only examples then run
+        # concurrently, each on its own pooled cursor
         example_basic_ingestion()
         example_batch_generation()
-        example_sql_queries()
-        example_search_and_filter()
-        example_statistics()
-        example_advanced_analytics()
+        run_read_examples([
+            example_sql_queries,
+            example_search_and_filter,
+            example_statistics,
+            example_advanced_analytics,
+        ])
 
         # Final summary
         print_section("✅ All Examples Completed!")
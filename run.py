@@ -3,17 +3,16 @@ Main entry point for DuckParqStream
 Starts the API server and optionally opens the web interface
 """
 import sys
-import subprocess
-import webbrowser
 from pathlib import Path
 import time
 import argparse
+from functools import lru_cache
 
 # Add backend to path
 backend_dir = Path(__file__).parent / 'backend'
 sys.path.insert(0, str(backend_dir))
 
-from config import API_HOST, API_PORT
+from config import API_HOST, API_PORT, API_WORKERS
 
 
 def start_server(open_browser: bool = True):
@@ -30,7 +29,15 @@ def start_server(open_browser: bool = True):
     # Open browser after a short delay
     if open_browser:
         def open_ui():
-            time.sleep(2)
+            import socket
+            import webbrowser
+            # Open as soon as the port accepts connections (up to ~10s)
+            probe_host = "127.0.0.1" if API_HOST in ("0.0.0.0", "") else API_HOST
+            for _ in range(200):
+                with socket.socket() as probe:
+                    if probe.connect_ex((probe_host, API_PORT)) == 0:
+                        break
+                time.sleep(0.05)
             ui_path = Path(__file__).parent / "frontend" / "index.html"
             webbrowser.open(f"file://{ui_path.absolute()}")
 
@@ -39,31 +46,43 @@ def start_server(open_browser: bool = True):
 
     # Start server
     import uvicorn
-    from api import app
+
+    if API_WORKERS > 1:
+        # Each worker process imports the app (and its DuckDB pool) itself
+        app = "api:app"
+    else:
+        from api import app
 
     try:
         uvicorn.run(
             app,
             host=API_HOST,
             port=API_PORT,
+            workers=API_WORKERS,
             log_level="info"
         )
     except KeyboardInterrupt:
         print("\n\n✅ Server stopped")
 
 
+@lru_cache(maxsize=1)
+def _generator():
+    """One TestDataGenerator per process (imported only by commands that need it)"""
+    from test_data_generator import TestDataGenerator
+    return TestDataGenerator()
+
+
 def generate_test_data(record_type: str = 'user', count: int = 1000):
     """Generate test data"""
-    from test_data_generator import TestDataGenerator
     from ingestion import ingestion_engine
 
     print(f"🔄 Generating {count} {record_type} records...")
 
-    generator = TestDataGenerator()
-    records = generator.generate_batch(record_type, count)
+    # Columns go straight into an Arrow table, no per-record dicts
+    table = _generator().generate_batch_table(record_type, count)
 
     print(f"💾 Ingesting records...")
-    result = ingestion_engine.append_to_parquet(records)
+    result = ingestion_engine.append_table(table)
 
     if result["status"] == "success":
         print(f"✅ Successfully ingested {result['records_processed']} records")
@@ -83,9 +102,13 @@ def query_stats():
 
     # File statistics
     files = ingestion_engine.get_file_stats()
-    print(f"\n📁 Parquet Files: {len(files)}")
-    for file_info in files:
-        print(f"  - {file_info['filename']}: {file_info['row_count']:,} rows, {file_info['file_size_mb']:.2f} MB")
+    # One write for the whole listing rather than a print per file
+    lines = [f"\n📁 Parquet Files: {len(files)}"]
+    lines.extend(
+        f"  - {file_info['filename']}: {file_info['row_count']:,} rows, {file_info['file_size_mb']:.2f} MB"
+        for file_info in files
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Query statistics
     stats = query_engine.get_statistics()
@@ -134,9 +157,11 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
 
-    if args.command == 'start':
-        start_server(open_browser=not args.no_browser)
-    elif args.command == 'generate':
-        generate_test_data(args.type, args.count)
-    elif args.command == 'stats':
-        query_stats()
+    # Each command imports only what it uses: uvicorn/FastAPI for start,
+    # the engines (and generator) for generate and stats
+    commands = {
+        'start': lambda: start_server(open_browser=not args.no_browser),
+        'generate': lambda: generate_test_data(args.type, args.count),
+        'stats': query_stats,
+    }
+    commands[args.command]()
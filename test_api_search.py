@@ -3,9 +3,14 @@ Test the API search endpoint directly
 """
 import requests
 import json
+import orjson
 
 API_BASE = 'http://localhost:8000'
 
+# One keep-alive connection for every request in this script
+session = requests.Session()
+session.headers.update({"Content-Type": "application/json"})
+
 print("=" * 60)
 print("Testing Search API Endpoint")
 print("=" * 60)
@@ -22,18 +27,17 @@ payload = {
 print(f"Payload: {json.dumps(payload)}")
 
 try:
-    response = requests.post(
+    response = session.post(
         f"{API_BASE}/query/search",
-        json=payload,
-        headers={"Content-Type": "application/json"}
+        json=payload
     )
 
     print(f"Status Code: {response.status_code}")
     print(f"Response:")
 
     if response.status_code == 200:
-        data = response.json()
-        print(json.dumps(data, indent=2))
+        data = orjson.loads(response.content)
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
     else:
         print(f"Error Response:")
         print(response.text)
@@ -57,16 +61,15 @@ payload2 = {
 print(f"Payload: {json.dumps(payload2)}")
 
 try:
-    response = requests.post(
+    response = session.post(
         f"{API_BASE}/query/search",
-        json=payload2,
-        headers={"Content-Type": "application/json"}
+        json=payload2
     )
 
     print(f"Status Code: {response.status_code}")
 
     if response.status_code == 200:
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"Found {data.get('row_count', 0)} records")
     else:
         print(f"Error Response:")
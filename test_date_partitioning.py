@@ -3,9 +3,11 @@ Test the new date-range partitioning system
 Structure: year/month/type_fromDay_toDay.parquet
 Example: 2025/10/log_01_20.parquet
 """
+import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
+import pyarrow as pa
 
 # Add backend to path
 backend_dir = Path(__file__).parent / 'backend'
@@ -13,11 +15,20 @@ sys.path.insert(0, str(backend_dir))
 
 from ingestion import ingestion_engine
 from query_engine import query_engine
+import config
 
 print("=" * 70)
 print("Testing Date-Range Partitioning System")
 print("=" * 70)
 
+# Tests 1 and 4 append log records of the same shape: declare it once so
+# neither append has to infer it
+LOG_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("level", pa.string()),
+    ("message", pa.string())
+])
+
 # Test 1: Ingest log data for October 5, 2025
 print("\n📥 Test 1: Ingest log data for October 5, 2025")
 print("-" * 70)
@@ -31,7 +42,8 @@ log_records = [
 result1 = ingestion_engine.append_to_parquet(
     records=log_records,
     data_date=datetime(2025, 10, 5),
-    data_type="log"
+    data_type="log",
+    schema=LOG_SCHEMA
 )
 
 print(f"✅ Status: {result1['status']}")
@@ -90,7 +102,8 @@ old_log_records = [
 result4 = ingestion_engine.append_to_parquet(
     records=old_log_records,
     data_date=datetime(2025, 9, 10),
-    data_type="log"
+    data_type="log",
+    schema=LOG_SCHEMA
 )
 
 print(f"✅ Status: {result4['status']}")
@@ -102,27 +115,32 @@ print(f"   Expected: 2025/09/log_01_20.parquet")
 print("\n📂 Test 5: Check Created File Structure")
 print("-" * 70)
 
+def sorted_entries(path):
+    """Directory entries by name; DirEntry caches type (and on Windows, size)"""
+    with os.scandir(path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+
 data_dir = Path("data/parquet")
 if data_dir.exists():
-    print(f"Data directory: {data_dir.absolute()}\n")
-
-    for year_dir in sorted(data_dir.iterdir()):
-        if year_dir.is_dir():
-            print(f"📁 {year_dir.name}/")
-            for month_dir in sorted(year_dir.iterdir()):
-                if month_dir.is_dir():
-                    print(f"  📁 {month_dir.name}/")
-                    for file in sorted(month_dir.glob("*.parquet")):
-                        size = file.stat().st_size / 1024  # KB
-                        print(f"    📄 {file.name} ({size:.2f} KB)")
+    # Build the tree listing, then write it once
+    lines = [f"Data directory: {data_dir.absolute()}\n"]
+    for year_dir in sorted_entries(data_dir):
+        if year_dir.is_dir(follow_symlinks=False):
+            lines.append(f"📁 {year_dir.name}/")
+            for month_dir in sorted_entries(year_dir.path):
+                if month_dir.is_dir(follow_symlinks=False):
+                    lines.append(f"  📁 {month_dir.name}/")
+                    for file in sorted_entries(month_dir.path):
+                        if file.name.endswith(".parquet"):
+                            size = file.stat().st_size / 1024  # KB
+                            lines.append(f"    📄 {file.name} ({size:.2f} KB)")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # Test 6: Query specific type
 print("\n🔍 Test 6: Query all log records")
 print("-" * 70)
 
-# Force refresh view for all files
-query_engine._register_parquet_view()
-
 result = query_engine.execute_sql(f"""
     SELECT * FROM all_records
     WHERE {config.TYPE_FIELD} = 'log'
@@ -138,22 +156,17 @@ if result['status'] == 'success':
 print("\n🔍 Test 7: Query October 2025 data")
 print("-" * 70)
 
-result = query_engine.query_by_date_range(
+result = query_engine.breakdown_by(
+    config.TYPE_FIELD,
     "2025-10-01",
-    "2025-10-31",
-    limit=100
+    "2025-10-31"
 )
 
 if result['status'] == 'success':
-    print(f"✅ Found {result['row_count']} records in October 2025")
-    types = {}
-    for record in result['data']:
-        data_type = record.get('data_type', 'unknown')
-        types[data_type] = types.get(data_type, 0) + 1
-
+    print(f"✅ Found {result['total_records']} records in October 2025")
     print(f"   Breakdown by type:")
-    for data_type, count in types.items():
-        print(f"     - {data_type}: {count} records")
+    for data_type, count in result['breakdown'].items():
+        print(f"     - {data_type or 'unknown'}: {count} records")
 
 print("\n" + "=" * 70)
 print("✅ Date-Range Partitioning Tests Complete!")
@@ -0,0 +1,113 @@
+"""
+Test the record_id index behind GET /query/id/{record_id}
+Run this when the API server is NOT running
+"""
+import sys
+import tempfile
+from pathlib import Path
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add backend to path
+backend_dir = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(backend_dir))
+
+from config import MAX_ROWS_PER_FILE
+from db_pool import DuckDBPool
+from id_index import RecordIdIndex
+from ingestion import ParquetIngestionEngine
+from query_engine import DuckDBQueryEngine
+
+# Scratch data directory and in-memory database, so real data is untouched
+data_dir = Path(tempfile.mkdtemp())
+pool = DuckDBPool(":memory:", size=2)
+index = RecordIdIndex(pool)
+engine = ParquetIngestionEngine(data_dir)
+engine.id_index = index
+query_engine = DuckDBQueryEngine(pool, data_dir=data_dir, index=index)
+
+
+def ingest(engine, prefix, start, stop, day):
+    records = [{"id": f"{prefix}{i:03d}", "n": i} for i in range(start, stop)]
+    result = engine.append_to_parquet(records, datetime(2025, 3, day), "log")
+    assert result['status'] == 'success', result
+    return result
+
+
+def wait_for_index_refresh():
+    """Background id index refreshes run in order on one worker"""
+    query_engine._index_executor.submit(lambda: None).result()
+
+
+print("=" * 60)
+print("Testing Record ID Index")
+print("=" * 60)
+
+# Test 1: Row groups are derived from write order and row_group_size
+print("\nTest 1: Row-group arithmetic in add()")
+print("-" * 60)
+index.add(data_dir / "arith.parquet", pa.array(["a0", "a1", "a2", "a3", "a4"]),
+          first_row_group=3, row_group_size=2)
+groups = [index.lookup(f"a{i}")[1] for i in range(5)]
+assert groups == [3, 3, 4, 4, 5], groups
+print(f"✅ IDs map to row groups {groups}")
+
+# Test 2: A file that fills up is renamed and the index follows it
+print("\nTest 2: Lookups across a rotation")
+print("-" * 60)
+assert 80 + 40 > MAX_ROWS_PER_FILE
+ingest(engine, "rec_", 0, 50, day=5)
+ingest(engine, "rec_", 50, 80, day=5)
+rotated = ingest(engine, "rec_", 80, 120, day=8)
+files = sorted(path.name for path in data_dir.rglob('*.parquet'))
+assert files == ['log_05_05.parquet', rotated['file']] == ['log_05_05.parquet', 'log_08_31.parquet'], files
+
+for record_id, file_name, row_group in [
+    ("rec_010", "log_05_05.parquet", 0),
+    ("rec_060", "log_05_05.parquet", 1),
+    ("rec_100", "log_08_31.parquet", 0),
+]:
+    result = query_engine.query_by_id(record_id)
+    assert result['row_count'] == 1 and result['data'][0]['id'] == record_id, result
+    assert result['query'] == f"id index: {file_name} row group {row_group}", result['query']
+    print(f"✅ {record_id} read from {file_name} row group {row_group}")
+
+# Test 3: Entries outside data_dir are never trusted
+print("\nTest 3: Entry pointing outside data_dir")
+print("-" * 60)
+outside = Path(tempfile.mkdtemp()) / "log_01_31.parquet"
+pq.write_table(pa.table({"record_id": ["rec_020"], "n": [-1]}), outside)
+index.add(outside, pa.array(["rec_020"]))
+result = query_engine.query_by_id("rec_020")
+assert result['row_count'] == 1 and result['data'][0]['n'] == 20, result
+assert not result['query'].startswith("id index"), result['query']
+print("✅ Fell back to a scan of data_dir")
+
+# Test 4: A removed file's IDs fall back to a scan that finds nothing
+print("\nTest 4: Stale entry for a removed file")
+print("-" * 60)
+(data_dir / "2025" / "03" / "log_08_31.parquet").unlink()
+result = query_engine.query_by_id("rec_100")
+assert result['status'] == 'success' and result['row_count'] == 0, result
+assert not result['query'].startswith("id index"), result['query']
+print("✅ No row returned for rec_100")
+
+# Test 5: Files written by another process are indexed by data_version()
+print("\nTest 5: Writes from another engine (no index attached)")
+print("-" * 60)
+script_engine = ParquetIngestionEngine(data_dir)
+ingest(script_engine, "ext_", 0, 10, day=20)
+assert index.lookup("ext_005") is None
+query_engine.data_version()
+wait_for_index_refresh()
+assert index.lookup("ext_005") is not None
+result = query_engine.query_by_id("ext_005")
+assert result['row_count'] == 1 and result['query'].startswith("id index"), result
+print(f"✅ ext_005 indexed after data_version(): {result['query']}")
+
+query_engine.close()
+
+print("\n" + "=" * 60)
+print("✅ Record ID Index Tests Complete!")
+print("=" * 60)
@@ -0,0 +1,146 @@
+"""
+Test the /ingest coalescing batcher
+Run this when the API server is NOT running
+"""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from datetime import datetime
+import pyarrow.parquet as pq
+
+# Add backend to path
+backend_dir = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(backend_dir))
+
+from ingestion import ParquetIngestionEngine, IngestBatcher
+
+DATE = datetime(2025, 3, 10)
+
+
+def new_engine():
+    """Engine over an empty scratch directory, so the real data is untouched"""
+    return ParquetIngestionEngine(Path(tempfile.mkdtemp()))
+
+
+def rows_on_disk(engine):
+    return sum(pq.read_metadata(f).num_rows for f in engine.data_dir.rglob('*.parquet'))
+
+
+def records(prefix, count, **fields):
+    return [{"id": f"{prefix}{i}", **fields} for i in range(count)]
+
+
+async def submit_all(engine, requests):
+    """Send requests concurrently through a running batcher"""
+    batcher = IngestBatcher(engine, max_wait=0.5)
+    batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.submit(*request) for request in requests))
+    finally:
+        await batcher.stop()
+
+
+print("=" * 60)
+print("Testing Ingest Batcher")
+print("=" * 60)
+
+# Test 1: Concurrent requests for one partition share a write
+print("\nTest 1: One partition, one flush")
+print("-" * 60)
+engine = new_engine()
+results = asyncio.run(submit_all(engine, [
+    (records(f"r{n}_", 10, v=n), DATE, "log") for n in range(5)
+]))
+assert all(r['status'] == 'success' for r in results), results
+assert [r['records_processed'] for r in results] == [10] * 5, results
+assert all(r['batched_requests'] == 5 for r in results), results
+assert rows_on_disk(engine) == 50
+print(f"✅ 5 requests written together, {rows_on_disk(engine)} rows on disk")
+
+# Test 2: Different dates/types are grouped separately
+print("\nTest 2: Requests grouped by partition")
+print("-" * 60)
+engine = new_engine()
+results = asyncio.run(submit_all(engine, [
+    (records("a", 5), DATE, "log"),
+    (records("b", 5), DATE, "event"),
+    (records("c", 5), DATE, "log"),
+]))
+assert [r['batched_requests'] for r in results] == [2, 1, 2], results
+assert {Path(r['file']).name for r in results} == {'log_10_31.parquet', 'event_10_31.parquet'}
+assert rows_on_disk(engine) == 15
+print("✅ log and event requests flushed as separate groups")
+
+# Test 3: Types are settled per request, not per flush window
+print("\nTest 3: Conflicting types are written one request at a time")
+print("-" * 60)
+engine = new_engine()
+results = asyncio.run(submit_all(engine, [
+    (records("i", 3, v=1), DATE, "log"),
+    (records("s", 3, v="x"), DATE, "log"),
+]))
+assert results[0]['status'] == 'success', results
+# Appended alone, a string v cannot join the file's int64 v either
+assert results[1]['status'] == 'error' and results[1]['records_processed'] == 0, results
+(data_file,) = engine.data_dir.rglob('*.parquet')
+assert str(pq.read_schema(data_file).field('v').type) == 'int64'
+assert rows_on_disk(engine) == 3
+print("✅ v stays int64; only the conflicting request failed")
+
+# Test 4: A group write that stored nothing is retried request by request
+print("\nTest 4: Retry after a failed write with no rows written")
+print("-" * 60)
+engine = new_engine()
+engine.append_many = lambda batches: [
+    {"status": "error", "message": "simulated", "records_processed": 0} for _ in batches
+]
+results = asyncio.run(submit_all(engine, [
+    (records(f"t{n}_", 4), DATE, "log") for n in range(3)
+]))
+assert all(r['status'] == 'success' and r['records_processed'] == 4 for r in results), results
+assert rows_on_disk(engine) == 12
+print(f"✅ Each request retried alone, {rows_on_disk(engine)} rows (no duplicates)")
+
+# Test 5: A write that may have stored rows fails the group without retrying
+print("\nTest 5: Failed finalization is not retried")
+print("-" * 60)
+engine = new_engine()
+
+
+def fail_append_many(batches):
+    raise OSError("simulated finalize failure")
+
+
+engine.append_many = fail_append_many
+results = asyncio.run(submit_all(engine, [
+    (records(f"f{n}_", 4), DATE, "log") for n in range(3)
+]))
+assert all(r['status'] == 'error' and 'simulated' in r['message'] for r in results), results
+assert rows_on_disk(engine) == 0
+print("✅ Every request got the error, nothing was rewritten")
+
+# Test 6: "wait": false answers 202 and the rows land on the batcher's flush
+print("\nTest 6: POST /ingest with wait=false")
+print("-" * 60)
+from fastapi.testclient import TestClient
+import api
+
+engine = new_engine()
+api.ingest_batcher.engine = engine
+with TestClient(api.app) as client:
+    response = client.post("/ingest", json={
+        "records": records("w", 7),
+        "data_date": "2025-03-10",
+        "data_type": "log",
+        "wait": False
+    })
+    assert response.status_code == 202, response.text
+    assert response.json()['records_queued'] == 7
+# Leaving the client stops the batcher, which flushes the queue
+assert rows_on_disk(engine) == 7
+print("✅ 202 Accepted, 7 rows written after the flush")
+
+print("\n" + "=" * 60)
+print("✅ Ingest Batcher Tests Complete!")
+print("=" * 60)
@@ -10,7 +10,7 @@ backend_dir = Path(__file__).parent / 'backend'
 sys.path.insert(0, str(backend_dir))
 
 from query_engine import query_engine
-import json
+import orjson
 
 print("=" * 60)
 print("Testing Search Functionality")
@@ -27,7 +27,7 @@ if result1['status'] == 'success':
     print(f"Duration: {result1['duration_seconds']}s")
     if result1['data']:
         print(f"\nFirst result:")
-        print(json.dumps(result1['data'][0], indent=2, default=str))
+        print(orjson.dumps(result1['data'][0], default=str, option=orjson.OPT_INDENT_2).decode())
 else:
     print(f"Error: {result1.get('message', 'Unknown error')}")
 
@@ -3,9 +3,14 @@ Test search after fix - Run AFTER restarting the API server
 """
 import requests
 import json
+import orjson
 
 API_BASE = 'http://localhost:8000'
 
+# One keep-alive connection for every request in this script
+session = requests.Session()
+session.headers.update({"Content-Type": "application/json"})
+
 print("=" * 70)
 print("Testing Search API - After Fix")
 print("=" * 70)
@@ -40,7 +45,7 @@ for i, test in enumerate(tests, 1):
     print(f"Payload: {json.dumps(test['payload'])}")
 
     try:
-        response = requests.post(
+        response = session.post(
             f"{API_BASE}/query/search",
             json=test['payload'],
             timeout=10
@@ -49,7 +54,7 @@ for i, test in enumerate(tests, 1):
         print(f"Status Code: {response.status_code}")
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"✅ SUCCESS")
             print(f"   Found: {data.get('row_count', 0)} records")
             print(f"   Duration: {data.get('duration_seconds', 0)}s")
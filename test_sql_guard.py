@@ -0,0 +1,45 @@
+"""
+Test the read-only guard on client-supplied SQL (POST /query/sql)
+Run this when the API server is NOT running
+"""
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(backend_dir))
+
+from query_engine import query_engine
+
+print("=" * 60)
+print("Testing SQL Guard")
+print("=" * 60)
+
+# Test 1: A trailing line comment must not swallow the wrapper's ")"
+print("\nTest 1: Query ending in a -- comment")
+print("-" * 60)
+result = query_engine.execute_user_sql(
+    "SELECT i FROM range(5) t(i) ORDER BY i DESC -- top", limit=3
+)
+assert result['status'] == 'success', result
+assert [row['i'] for row in result['data']] == [4, 3, 2], result['data']
+print(f"✅ {result['row_count']} rows, comment kept out of the wrapper")
+
+# Test 2: The limit still caps the result
+print("\nTest 2: Limit is enforced")
+print("-" * 60)
+result = query_engine.execute_user_sql("SELECT * FROM range(100);", limit=10)
+assert result['status'] == 'success' and result['row_count'] == 10, result
+print(f"✅ {result['row_count']} rows returned for limit=10")
+
+# Test 3: Non-SELECT and multi-statement input is rejected
+print("\nTest 3: DDL and batches are rejected")
+print("-" * 60)
+for query in ["DROP VIEW all_records", "SELECT 1; SELECT 2"]:
+    result = query_engine.execute_user_sql(query)
+    assert result['status'] == 'error', (query, result)
+    print(f"✅ Rejected: {query} ({result['message']})")
+
+print("\n" + "=" * 60)
+print("✅ SQL Guard Tests Complete!")
+print("=" * 60)